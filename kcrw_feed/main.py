@@ -157,9 +157,11 @@ def main():
     # Pull in live state from kcrw.com only if necessary
     if args.command in ["diff", "update"]:
         live_catalog = station_catalog.LiveStationCatalog(
-            catalog_source=live_source)
+            catalog_source=live_source,
+            max_workers=CONFIG.get("sitemap_workers", 1))
         catalog_updater = updater.CatalogUpdater(
-            local_catalog, live_catalog, filter_opts)
+            local_catalog, live_catalog, filter_opts,
+            max_workers=CONFIG.get("enrich_workers", 1))
 
     if args.command == "list":
         if args.mode == "resources":
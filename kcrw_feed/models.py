@@ -51,7 +51,7 @@ class Resource:
         return self.url == other.url
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class Host:
     sort_index: str = field(init=False, repr=False)  # used for ordering
     name: str
@@ -85,7 +85,7 @@ class Host:
         return self.uuid == other.uuid
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class Show:
     sort_index: str = field(init=False, repr=False)  # used for ordering
     title: str
@@ -116,7 +116,7 @@ class Show:
         return self.uuid == other.uuid
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class Episode:
     sort_index: datetime = field(init=False, repr=False)  # used for ordering
     title: str
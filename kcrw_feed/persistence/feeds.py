@@ -58,10 +58,12 @@ class FeedPersister(BasePersister):
             # Use the show's title as the filename (or fallback to UUID).
             file_name = f"{show.title}.xml" if show.title else f"{show.uuid}.xml"
             output_path = os.path.join(feed_directory, file_name)
-            with atomic_write(output_path, mode="w", overwrite=True, encoding="utf-8") as f:
+            with atomic_write(output_path, mode="wb", overwrite=True) as f:
                 f.write(feed_xml)
 
-    def generate_rss_feed(self, show: Show) -> str:
+    def generate_rss_feed(self, show: Show) -> bytes:
+        """Build the RSS feed for a show as UTF-8 encoded XML bytes, ready
+        to be written out without a decode/encode round trip."""
 
         host_name = ""
         if show.hosts:
@@ -110,8 +112,8 @@ class FeedPersister(BasePersister):
             # fe.podcast.itunes_author(host_name)
             # fe.podcast.itunes_duration(length)
 
-        return fg.rss_str(pretty=True).decode("utf-8")
-        # return fg.rss_str().decode("utf-8")
+        return fg.rss_str(pretty=True)
+        # return fg.rss_str()
 
     def load(self, filename: str) -> ShowDirectory:
         raise NotImplementedError("RSS load not implemented")
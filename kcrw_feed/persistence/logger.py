@@ -60,6 +60,10 @@ class JSONFormatter(logging.Formatter):
     def __init__(self, *, fmt_keys: dict[str, str] | None = None):
         super().__init__()
         self.fmt_keys = fmt_keys if fmt_keys is not None else {}
+        # (whole second, formatted second): bursts of records within the
+        # same second reuse the formatted prefix. Kept as one tuple so the
+        # pair is swapped atomically.
+        self._last_second: tuple[int, str] = (-1, "")
 
     @override
     def format(self, record: logging.LogRecord) -> str:
@@ -69,9 +73,7 @@ class JSONFormatter(logging.Formatter):
     def _prepare_log_dict(self, record: logging.LogRecord):
         always_fields = {
             "level": record.levelname,
-            "timestamp": dt.datetime.fromtimestamp(
-                record.created, tz=dt.timezone.utc
-            ).isoformat(),
+            "timestamp": self._format_timestamp(record),
             "message": record.getMessage(),
         }
         if record.exc_info is not None:
@@ -94,6 +96,17 @@ class JSONFormatter(logging.Formatter):
 
         return message
 
+    def _format_timestamp(self, record: logging.LogRecord) -> str:
+        """ISO 8601 UTC timestamp with millisecond precision."""
+        second = int(record.created)
+        cached_second, prefix = self._last_second
+        if second != cached_second:
+            prefix = dt.datetime.fromtimestamp(
+                second, tz=dt.timezone.utc
+            ).strftime("%Y-%m-%dT%H:%M:%S")
+            self._last_second = (second, prefix)
+        return f"{prefix}.{int(record.msecs):03d}+00:00"
+
 
 # TODO: Modify filter to send INFO and DEBUG to stdout, and the rest to
 # stderr.
@@ -1,15 +1,18 @@
 """Module to handle state persistence"""
 
+from dataclasses import fields, is_dataclass
 from datetime import datetime
-from dataclasses import asdict
+import functools
 import json
 import logging
 import os
+import re
 from typing import Any, Dict, Union, cast
 import uuid
-from collections import OrderedDict
 
 from atomicwrites import atomic_write
+import orjson
+import simdjson
 
 from kcrw_feed.persistence.base import BasePersister
 from kcrw_feed.persistence.logger import TRACE_LEVEL_NUM
@@ -20,32 +23,29 @@ from kcrw_feed import utils
 logger = logging.getLogger("kcrw_feed")
 
 
-class SortedJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime and UUID objects."""
+# orjson serializes UUIDs and datetimes natively, and dataclasses are turned
+# into shallow dicts by a default hook rather than deep-copied by asdict()
+# first. UUID dict keys (Catalog) need OPT_NON_STR_KEYS.
+STATE_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
 
-    def default(self, obj: Any) -> Any:
-        """Handle custom types like datetime and UUID."""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if isinstance(obj, uuid.UUID):
-            return str(obj)
-        return super().default(obj)
 
+# Show and host UUIDs repeat on every episode in the state file; UUIDs are
+# immutable, so each string only needs to be parsed once.
+_uuid_from_str = functools.lru_cache(maxsize=8192)(uuid.UUID)
+
+# orjson always writes UTF-8; the state files have always been ASCII with
+# \uXXXX escapes (json.dump's ensure_ascii), which also escapes DEL.
+_NON_ASCII_RE = re.compile("[^\x00-\x7e]+")
 
-def sort_collection(obj: Any) -> Any:
-    """Recursively sort dictionary keys for stable JSON output."""
-    if isinstance(obj, dict):
-        # Create a new OrderedDict with sorted keys
-        return OrderedDict((k, sort_collection(v)) for k, v in sorted(obj.items()))
-    elif isinstance(obj, list):
-        # Process list items but maintain their order
-        return [sort_collection(item) for item in obj]
-    elif isinstance(obj, tuple):
-        # Process tuple items but maintain their order
-        return tuple(sort_collection(item) for item in obj)
-    else:
-        # Return other types as is
-        return obj
+
+def _ascii_escape(match: re.Match) -> str:
+    """Escape a run of non-ASCII characters exactly as json.dumps does."""
+    return json.dumps(match.group())[1:-1]
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
 
 
 class StatePersister(BasePersister):
@@ -57,38 +57,55 @@ class StatePersister(BasePersister):
 
     # Serialization
     def default_serializer(self, obj: Any) -> Any:
-        """Helper to convert non-serializable objects like datetime."""
+        """Helper to convert non-serializable objects like datetime. orjson
+        handles datetime and UUID itself and only calls this (as its
+        default hook) for types it doesn't know."""
         if isinstance(obj, datetime):
             return obj.isoformat()
         if isinstance(obj, uuid.UUID):
             return str(obj)
         raise TypeError(f"Type {type(obj)} not serializable")
 
-    def save(self, state: Union[ShowDirectory, Catalog], filename: str | None = None) -> None:
-        """Save the given state object to a JSON file."""
-        filename = filename or self.filename
-        logger.info("Writing state file: %s", filename)
-
-        # Convert to dictionary based on type. ShowDirectory is a list of shows,
-        # and so can directly converted to a dict using asdict.
+    def dataclass_serializer(self, obj: Any) -> Any:
+        """Default hook used with OPT_PASSTHROUGH_DATACLASS. Returns each
+        entity as a dict in field declaration order, as asdict() did; orjson's
+        native path follows __dict__ order for unslotted dataclasses such as
+        Resource, and OPT_SORT_KEYS only sorts dicts."""
+        if is_dataclass(obj):
+            return {name: getattr(obj, name) for name in _field_names(type(obj))}
+        return self.default_serializer(obj)
+
+    def serialize(self, state: Union[ShowDirectory, Catalog]) -> bytes:
+        """Return the JSON encoding of the given state object."""
+        # ShowDirectory keeps every field in declaration order, as asdict() did.
         if isinstance(state, ShowDirectory):
-            data = asdict(state)
+            encoded = orjson.dumps(
+                state, default=self.dataclass_serializer,
+                option=STATE_DUMP_OPTIONS | orjson.OPT_PASSTHROUGH_DATACLASS)
         else:  # Catalog is a dict of shows, episodes, hosts, and resources,
-            # so we need to convert each to a dict by hand (taking care to
-            # ensure that keys are str) and then add to the top-level dict
-            # before calling asdict.
+            # keyed by UUID (or url for resources). Every key, down to the
+            # entity fields, is sorted so the file diffs cleanly.
             data = {
                 "type": "catalog",
-                "shows": {str(k): asdict(v) for k, v in state.shows.items()},
-                "episodes": {str(k): asdict(v) for k, v in state.episodes.items()},
-                "hosts": {str(k): asdict(v) for k, v in state.hosts.items()},
-                "resources": {k: asdict(v) for k, v in state.resources.items()}
+                "shows": state.shows,
+                "episodes": state.episodes,
+                "hosts": state.hosts,
+                "resources": state.resources
             }
-            # Sort collection keys for stable output
-            data = sort_collection(data)
+            encoded = orjson.dumps(
+                data, default=self.dataclass_serializer,
+                option=STATE_DUMP_OPTIONS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if not encoded.isascii():
+            encoded = _NON_ASCII_RE.sub(
+                _ascii_escape, encoded.decode("utf-8")).encode("ascii")
+        return encoded
 
-        with atomic_write(filename, mode="w", overwrite=True, encoding="utf-8") as f:
-            json.dump(data, f, cls=SortedJSONEncoder, indent=2)
+    def save(self, state: Union[ShowDirectory, Catalog], filename: str | None = None) -> None:
+        """Save the given state object to a JSON file."""
+        filename = filename or self.filename
+        logger.info("Writing state file: %s", filename)
+        with atomic_write(filename, mode="wb", overwrite=True) as f:
+            f.write(self.serialize(state))
 
     # Deserialization helpers
     def _parse_datetime(self, date_str: str) -> datetime:
@@ -97,7 +114,7 @@ class StatePersister(BasePersister):
 
     def _parse_uuid(self, uuid_str: str) -> uuid.UUID:
         """Assume valid UUID format."""
-        return uuid.UUID(uuid_str)
+        return _uuid_from_str(uuid_str)
 
     def episode_from_dict(self, data: Dict[Any, Any]) -> Episode:
         episode_uuid = self._parse_uuid(
@@ -122,7 +139,8 @@ class StatePersister(BasePersister):
             uuid=episode_uuid,
             show_uuid=show_uuid,
             # Hosts are stored by UUID in Episodes
-            hosts=[self._parse_uuid(h) for h in data.get("hosts", []) if h],
+            hosts=[self._parse_uuid(h)
+                   for h in data.get("hosts", ()) if h],
             description=data.get("description"),
             songlist=data.get("songlist"),
             image=data.get("image"),
@@ -162,9 +180,12 @@ class StatePersister(BasePersister):
         # TODO: Transition: uuid str -> uuid.UUID
         assert isinstance(
             show_uuid, uuid.UUID) or isinstance(show_uuid, str), "uuid is required for Shows"
-        episodes = [self.episode_from_dict(ep)
-                    for ep in data.get("episodes", [])]
-        hosts = [self.host_from_dict(h) for h in data.get("hosts", [])]
+        # Bind the per-item converters once; a show can hold hundreds of
+        # episodes.
+        episode_from_dict = self.episode_from_dict
+        host_from_dict = self.host_from_dict
+        episodes = [episode_from_dict(ep) for ep in data.get("episodes", ())]
+        hosts = [host_from_dict(h) for h in data.get("hosts", ())]
         resource = self.resource_from_dict(data.get("resource", {}))
         last_updated = self._parse_datetime(
             data["last_updated"]) if data.get("last_updated") else None
@@ -189,11 +210,17 @@ class StatePersister(BasePersister):
             last_updated = self._parse_datetime(data.get("last_updated"))
             lastmod = self._parse_datetime(
                 data.get("metadata", {}).get("lastmod"))
+            url = data["url"]
+            metadata = data.get("metadata", {})
+            # metadata["loc"] is normally the url again; share the one
+            # string instead of keeping a second copy per resource.
+            if metadata.get("loc") == url:
+                metadata["loc"] = url
             resource = Resource(
-                url=data["url"],
+                url=url,
                 source=data.get("source", ""),
                 last_updated=last_updated,
-                metadata=data.get("metadata", {})
+                metadata=metadata
             )
             resource.metadata["lastmod"] = lastmod
             return resource
@@ -258,10 +285,14 @@ class StatePersister(BasePersister):
         with open(filename, "rb") as f:
             raw = f.read()
             logger.debug("Read %d bytes from %s", len(raw), filename)
-            data = json.loads(raw.decode("utf-8"))
+        # Parse lazily: simdjson only builds Python objects for the parts of
+        # the document we touch.
+        doc = simdjson.Parser().parse(raw)
 
         # Check if this is a Catalog or ShowDirectory
-        if isinstance(data, dict) and "type" in data and data["type"] == "catalog":
-            return self.catalog_from_dict(data)
-        else:
-            return self.directory_from_dict(data)
+        if isinstance(doc, simdjson.Object) and doc.get("type") == "catalog":
+            # The catalog is rebuilt from its shows alone, so the (redundant)
+            # episodes, hosts and resources collections are never decoded.
+            return self.catalog_from_dict({"type": "catalog",
+                                           "shows": doc["shows"].as_dict()})
+        return self.directory_from_dict(doc.as_dict())
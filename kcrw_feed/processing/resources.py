@@ -1,11 +1,13 @@
 """Module to gather the urls of shows and episodes"""
 
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 import logging
 import pprint
 import re
-from typing import Any, Dict, List, Set
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
 import urllib.robotparser as urobot
-import xmltodict
+from lxml import etree
 
 from kcrw_feed.models import Resource
 from kcrw_feed.persistence.logger import TRACE_LEVEL_NUM
@@ -14,22 +16,34 @@ from kcrw_feed import utils
 
 # Regular expression to match sitemap XML filenames.
 SITEMAP_RE = re.compile(r"sitemap.*\.xml", re.IGNORECASE)
-# Filter for URLs that pertain to music shows.
-MUSIC_FILTER_RE = re.compile(
-    r"(/sitemap-shows/music/|/music/shows/)", re.IGNORECASE)
+# Filter for URLs that pertain to music shows: lowercase path substrings,
+# matched case-insensitively by is_music_url on every sitemap <loc>.
+MUSIC_FILTER_PATHS = ("/sitemap-shows/music/", "/music/shows/")
+MUSIC_FILTER_BYTES = tuple(path.encode("ascii") for path in MUSIC_FILTER_PATHS)
+# Screens raw sitemap bytes for any music path without copying them.
+MUSIC_BYTES_RE = re.compile(
+    b"|".join(map(re.escape, MUSIC_FILTER_BYTES)), re.IGNORECASE)
 ROBOTS_FILE = "robots.txt"
+# Sitemap index and urlset entries, matched in any namespace.
+SITEMAP_TAG = "{*}sitemap"
+URL_TAG = "{*}url"
 
 logger = logging.getLogger("kcrw_feed")
 
 
 class ResourceProcessor:
-    def __init__(self, source: BaseSource) -> None:
+    def __init__(self, source: BaseSource, max_workers: int = 1) -> None:
         """Parameters:
             source: The base URL (or local base path) for the site.
+            max_workers: Number of sitemaps to fetch concurrently.
         """
         self.source = source
+        self.max_workers = max(1, max_workers)
         # map: url -> Resource
         self._resources: Dict[str, Resource] = {}
+        # map: sitemap -> bytes, so each sitemap is fetched only once per
+        # crawl; entries are dropped as soon as they have been ingested
+        self._sitemap_bytes: Dict[str, Optional[bytes]] = {}
 
     # Populate Methods
     def fetch_resources(self) -> Dict[str, Any]:
@@ -38,19 +52,34 @@ class ResourceProcessor:
             List[str]: A sorted list of show references.
         """
         logger.debug("Gathering sitemap entries from %s", self.source)
-        # Start by reading robots.txt to get the initial sitemap URLs.
-        root_sitemaps = self._sitemaps_from_robots()
-        # Recursively collect all sitemap URLs.
-        all_sitemaps = self._collect_sitemaps(root_sitemaps)
-        logger.debug("All sitemaps collected: %s", all_sitemaps)
-        # TODO: We're fetching and reading the sitemaps twice. We should cache
-        # to avoid excessive load.
-        logger.debug("Reading sitemaps for entries")
-        # Process each sitemap to extract show entries.
-        for sitemap in all_sitemaps:
-            self._read_sitemap_for_entries(sitemap)
+        try:
+            # Start by reading robots.txt to get the initial sitemap URLs.
+            root_sitemaps = self._sitemaps_from_robots()
+            # Recursively collect all sitemap URLs.
+            all_sitemaps = self._collect_sitemaps(root_sitemaps)
+            logger.debug("All sitemaps collected: %s", all_sitemaps)
+            logger.debug("Reading sitemaps for entries")
+            # Fetch sitemaps concurrently (network I/O only) and process each
+            # one for show entries on this thread, in a stable order.
+            sitemaps = sorted(all_sitemaps)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for sitemap, sitemap_bytes in zip(
+                        sitemaps, executor.map(self._get_sitemap, sitemaps)):
+                    self._ingest_sitemap_entries(sitemap, sitemap_bytes)
+                    self._sitemap_bytes.pop(sitemap, None)
+        finally:
+            # Don't hold raw sitemaps past the crawl, or serve them stale to
+            # the next one.
+            self._sitemap_bytes.clear()
         return self._resources
 
+    def _get_sitemap(self, sitemap: str) -> Optional[bytes]:
+        """Fetch a sitemap, reusing the bytes if it was already read while
+        collecting sitemaps."""
+        if sitemap not in self._sitemap_bytes:
+            self._sitemap_bytes[sitemap] = self.source.get_reference(sitemap)
+        return self._sitemap_bytes[sitemap]
+
     def _sitemaps_from_robots(self) -> List[str]:
         """Reads the robots.txt file and extracts root sitemap URLs.
 
@@ -74,10 +103,12 @@ class ResourceProcessor:
         ]
         if logger.isEnabledFor(getattr(logging, "TRACE", TRACE_LEVEL_NUM)):
             logger.trace("Stripped sitemaps from robots.txt: %s", sitemap_urls)
-        return list(set(sitemap_urls))
+        # De-duplicate while keeping robots.txt order.
+        return list(dict.fromkeys(sitemap_urls))
 
     def _collect_sitemaps(self, sitemaps: List[str]) -> Set[str]:
-        """Recursively collects sitemap URLs from sitemap index files.
+        """Collects sitemap URLs from sitemap index files, however deeply
+        they nest.
 
         Parameters:
             sitemaps: Initial list of sitemap URLs.
@@ -85,13 +116,20 @@ class ResourceProcessor:
         Returns:
             A set of all discovered sitemap URLs."""
         collected: Set[str] = set(sitemaps)
-        for sitemap in sitemaps:
-            child_sitemaps = self._read_sitemap_for_child_sitemaps(sitemap)
-            for child in child_sitemaps:
-                if child not in collected:
-                    collected.add(child)
-                    # Recursively collect from child sitemap
-                    collected.update(self._collect_sitemaps([child]))
+        # Walk the index tree a level at a time: fetch the whole level
+        # concurrently (network I/O only), then parse it on this thread.
+        level = sorted(collected)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while level:
+                for _ in executor.map(self._get_sitemap, level):
+                    pass
+                next_level = []
+                for sitemap in level:
+                    for child in self._read_sitemap_for_child_sitemaps(sitemap):
+                        if child not in collected:
+                            collected.add(child)
+                            next_level.append(child)
+                level = next_level
         return collected
 
     def _read_sitemap_for_child_sitemaps(self, sitemap: str) -> List[str]:
@@ -99,36 +137,25 @@ class ResourceProcessor:
         Returns:
             List[str]: Child sitemap URLs, or an empty list if none are found."""
         logger.info("reading sitemap: %s", sitemap)
-        sitemap_bytes = self.source.get_reference(sitemap)
+        sitemap_bytes = self._get_sitemap(sitemap)
         if not sitemap_bytes:
             logger.warning("Sitemap %s could not be retrieved", sitemap)
             return []
+        if not _mentions_music(sitemap_bytes):
+            logger.debug("No music entries in sitemap %s", sitemap)
+            return []
+        # Stream the <sitemap> entries of a sitemap index; a urlset has
+        # none, so no child sitemaps.
+        child_sitemaps = []
         try:
-            sitemap_str = sitemap_bytes.decode("utf-8")
-            doc = xmltodict.parse(sitemap_str)
-        except Exception as e:
+            for entry in _iter_entries(sitemap_bytes, SITEMAP_TAG):
+                loc = entry.get("loc")
+                if loc:
+                    child_sitemaps.append(loc.strip())
+        except etree.LxmlError as e:
             logger.warning("Sitemap %s could not be parsed: %s", sitemap, e)
             return []
 
-        # Check if this is a sitemap index
-        sitemap_index = doc.get("sitemapindex")
-        if not sitemap_index:
-            # Not a sitemap index, so no child sitemaps.
-            return []
-
-        # The "sitemap" key may be a single dict or a list
-        sitemap_entries = sitemap_index.get("sitemap")
-        if not sitemap_entries:
-            return []
-
-        if isinstance(sitemap_entries, dict):
-            sitemap_entries = [sitemap_entries]
-
-        child_sitemaps = []
-        for entry in sitemap_entries:
-            loc = entry.get("loc")
-            if loc:
-                child_sitemaps.append(loc.strip())
         if logger.isEnabledFor(getattr(logging, "TRACE", TRACE_LEVEL_NUM)):
             logger.trace("Found child_sitemaps: %s",
                          pprint.pformat(child_sitemaps))
@@ -136,46 +163,30 @@ class ResourceProcessor:
         child_sitemaps = [
             self.source.relative_path(url)
             for url in child_sitemaps
-            if MUSIC_FILTER_RE.search(url)
+            if is_music_url(url)
         ]
         logger.debug("Child sitemaps to read: %s", child_sitemaps)
         return child_sitemaps
 
-    def _read_sitemap_for_entries(self, sitemap: str) -> None:
-        """Reads a sitemap and extracts show references from <url>/<loc> tags,
-        adding them to self._sitemap_entities."""
-        sitemap_bytes = self.source.get_reference(sitemap)
+    def _ingest_sitemap_entries(self, sitemap: str,
+                                sitemap_bytes: Optional[bytes]) -> None:
+        """Extracts show references from <url>/<loc> tags of already fetched
+        sitemap bytes, adding them to self._resources."""
         if not sitemap_bytes:
             logger.warning("Sitemap %s could not be retrieved", sitemap)
             return
-        try:
-            sitemap_str = sitemap_bytes.decode("utf-8")
-            doc = xmltodict.parse(sitemap_str)
-        except Exception as e:
-            logger.warning("Sitemap %s could not be parsed: %s", sitemap, e)
-            return
-
-        # Check if this is a URL sitemap (typically under the "urlset" key)
-        urlset = doc.get("urlset")
-        if not urlset:
-            # If not, it might be a sitemap index or unexpected format; nothing to do here.
-            return
-
-        urls = urlset.get("url")
-        if not urls:
+        if not _mentions_music(sitemap_bytes):
+            logger.debug("No music entries in sitemap %s", sitemap)
             return
-
-        # Normalize a single URL entry to a list
-        if isinstance(urls, dict):
-            urls = [urls]
-
-        if logger.isEnabledFor(getattr(logging, "TRACE", TRACE_LEVEL_NUM)):
-            logger.trace("Raw sitemap entries: %s", pprint.pformat(urls))
-
-        for entry in urls:
-            url = entry.get("loc").strip()
-            # Keep only music shows
-            if url and MUSIC_FILTER_RE.search(url):
+        # Stream the <url> entries of a urlset, keeping only music shows, and
+        # build each Resource as its entry comes off the parser; a sitemap
+        # index or unexpected format has none, so nothing to do here. A
+        # sitemap that fails to parse part way through contributes nothing.
+        resources: Dict[str, Resource] = {}
+        try:
+            for entry in _iter_entries(sitemap_bytes, URL_TAG,
+                                       loc_filter=is_music_url):
+                url = entry["loc"] = entry["loc"].strip()
                 dt = None
                 if entry.get("lastmod", None):
                     dt = utils.parse_date(entry["lastmod"])
@@ -188,4 +199,82 @@ class ResourceProcessor:
                 )
                 if logger.isEnabledFor(getattr(logging, "TRACE", TRACE_LEVEL_NUM)):
                     logger.trace(pprint.pformat(resource))
-                self._resources[url] = resource
+                resources[url] = resource
+        except etree.LxmlError as e:
+            logger.warning("Sitemap %s could not be parsed: %s", sitemap, e)
+            return
+        self._resources.update(resources)
+
+
+def is_music_url(url: str) -> bool:
+    """Return True if url belongs to a music show (see MUSIC_FILTER_PATHS).
+
+    Substring tests on the lowercased url are several times faster than
+    a case-insensitive regex search across large sitemaps."""
+    url = url.lower()
+    return any(path in url for path in MUSIC_FILTER_PATHS)
+
+
+def _mentions_music(sitemap_bytes: bytes) -> bool:
+    """Cheap screen on the raw payload: a sitemap that never mentions a
+    music path can't yield music entries or child sitemaps, so there is no
+    need to parse it."""
+    return MUSIC_BYTES_RE.search(sitemap_bytes) is not None
+
+
+def _iter_entries(sitemap_bytes: bytes, tag: str,
+                  loc_filter: Optional[Callable[[str], Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream the entries matching tag out of a sitemap, yielding each one
+    as a dict. If loc_filter is given, entries whose <loc> it rejects are
+    skipped without being converted. Elements are discarded as soon as they
+    have been handled, so memory stays flat however large the sitemap is."""
+    for _, elem in etree.iterparse(BytesIO(sitemap_bytes), events=("end",),
+                                   tag=tag, collect_ids=False):
+        entry = None
+        if loc_filter is None or loc_filter((elem.findtext("{*}loc") or "").strip()):
+            entry = _element_to_dict(elem)
+        elem.clear()
+        # Drop already-processed siblings still referenced by the root.
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+        if entry is not None:
+            yield entry if isinstance(entry, dict) else {}
+
+
+def _element_to_dict(elem: etree._Element) -> Any:
+    """Convert an element into the same shape xmltodict produces: children
+    keyed by their qualified ("prefix:name") tag, repeated children
+    collected into a list, leaf elements reduced to their stripped text.
+
+    e.g. <image:image><image:loc>x</image:loc></image:image>
+      -> {"image:loc": "x"}"""
+    data: Dict[str, Any] = {}
+    if elem.attrib:
+        data.update((f"@{k}", v) for k, v in elem.attrib.items())
+    for child in elem:
+        tag = child.tag
+        if not isinstance(tag, str):
+            # Comments and processing instructions
+            continue
+        # "{namespace}name" -> "prefix:name"
+        key = tag.rpartition("}")[2]
+        prefix = child.prefix
+        if prefix:
+            key = f"{prefix}:{key}"
+        if len(child) or child.attrib:
+            value = _element_to_dict(child)
+        else:
+            # Leaf element (the common case): just its text
+            value = (child.text or "").strip() or None
+        if key not in data:
+            data[key] = value
+        elif isinstance(data[key], list):
+            data[key].append(value)
+        else:
+            data[key] = [data[key], value]
+    text = (elem.text or "").strip()
+    if not data:
+        return text or None
+    if text:
+        data["#text"] = text
+    return data
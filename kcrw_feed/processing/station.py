@@ -1,16 +1,19 @@
 """Module to enrich resource data and populate the core model objects"""
 
 from __future__ import annotations
+import bisect
 from datetime import datetime
-import json
+import functools
 import logging
 import pprint
 import re
 from typing import List, Dict, Optional, Set, Union
-from urllib.parse import urljoin, urlparse, urlunparse
+from urllib.parse import urljoin, urlunparse
 import uuid
-import extruct
-from bs4 import BeautifulSoup
+from extruct.utils import parse_html
+from extruct.w3cmicrodata import MicrodataExtractor
+from lxml import etree
+import orjson
 
 from kcrw_feed.models import Show, Episode, Host, Resource, FilterOptions
 from kcrw_feed.station_catalog import BaseStationCatalog
@@ -28,6 +31,15 @@ SHOW_URL_REGEX = re.compile(r"/music/shows/[^/]+/?$")
 EPISODE_URL_REGEX = re.compile(r"/music/shows/[^/]+/[^/]+")
 # This regex captures the protocol, domain, and the first segment after "/music/shows/"
 SHOW_FROM_EPISODE = re.compile(r'^(https?://[^/]+/music/shows/[^/]+)(/.*)?$')
+# Top-level microdata items on a show page that _process_show reads: the
+# RadioSeries itself and the "...-episodes" list. Extracting only these
+# skips the many unrelated items (nav, players, people) on each page.
+SHOW_ITEMS_XPATH = etree.XPath(
+    '//*[@itemscope][not(@itemprop and ancestor::*[@itemscope])]'
+    '[normalize-space(@itemtype) = "http://schema.org/RadioSeries"'
+    ' or (normalize-space(@itemtype) and substring(normalize-space(@itemid),'
+    ' string-length(normalize-space(@itemid)) - 8) = "-episodes")]')
+MICRODATA_EXTRACTOR = MicrodataExtractor()
 
 
 logger = logging.getLogger("kcrw_feed")
@@ -44,9 +56,7 @@ class StationProcessor:
     def is_episode_resource(self, resource: Resource) -> bool:
         """Determine if the resource URL represents an episode (and not a show).
         A show URL should have two segments after '/music/shows/'."""
-        parsed = urlparse(resource.url)
-        # Use the regex on the path portion.
-        return bool(EPISODE_URL_REGEX.search(parsed.path))
+        return _is_episode_url(resource.url)
 
     def is_show_resource(self, resource: Resource) -> bool:
         """If it's not an episode, assume it's a show."""
@@ -80,12 +90,11 @@ class StationProcessor:
                     show, Show), "We got something other than a Show!?"
                 touched.add(entity)
             # print(f"=> episode from show: {show.url}")
-            episodes = show.episodes
-            if entity not in episodes:
+            if entity not in show.episodes:
                 # print(f"adding episode to episode list")
-                episodes = show.episodes
-                episodes.append(entity)
-                show.episodes = sorted(episodes)
+                # show.episodes is kept sorted: insert in place instead of
+                # re-sorting the whole list for every new episode.
+                bisect.insort(show.episodes, entity)
         # List of entities touched
         touched.add(entity)
         assert len(touched) == 1 or len(
@@ -111,9 +120,9 @@ class StationProcessor:
         """Fetch a Show page and extract basic details."""
 
         # Check if we have an exact match in cache
-        for show in self.catalog.list_shows():
-            if show.resource and show.resource == resource:
-                return show
+        cached_show = self.catalog.get_show_by_resource(resource)
+        if cached_show:
+            return cached_show
 
         show_reference = self.source.relative_path(resource.url)
         logger.debug("show_reference: %s", show_reference)
@@ -128,8 +137,7 @@ class StationProcessor:
             return
 
         # Try to extract structured data using extruct (e.g., microdata).
-        data = extruct.extract(
-            html, base_url=resource.url, syntaxes=["microdata"])
+        data = {"microdata": _extract_show_items(html, resource.url)}
         if logger.isEnabledFor(TRACE_LEVEL_NUM):
             logger.trace("Extracted data: %s", pprint.pformat(data))
 
@@ -171,7 +179,7 @@ class StationProcessor:
             logger.debug("show_uuid: %s", show_uuid)
 
             show = Show(
-                title=show_data.get("name", resource.url.split("/")[-1]),
+                title=show_data.get("name", resource.url.rpartition("/")[2]),
                 url=show_data.get("properties", {}).get(
                     "mainEntityOfPage"),
                 image=image_loc,
@@ -185,17 +193,7 @@ class StationProcessor:
                 last_updated=last_updated
             )
         else:
-            # Fallback: use BeautifulSoup to get the title.
-            soup = BeautifulSoup(html, "html.parser")
-            title_tag = soup.find("title")
-            title = title_tag.text.strip(
-            ) if title_tag else url.split("/")[-1]
-            show = Show(
-                title=title,
-                url=url,
-                last_updated=last_updated,
-                metadata={}
-            )
+            logger.error("No RadioSeries microdata found for %s", resource.url)
             raise NotImplementedError
         if show:
             self.catalog.add_show(show)
@@ -235,9 +233,9 @@ class StationProcessor:
         """Fetch the player for the Episode and extract details."""
 
         # Check if we have an exact match in cache
-        for episode in self.catalog.list_episodes():
-            if episode.resource and episode.resource == resource:
-                return episode
+        cached_episode = self.catalog.get_episode_by_resource(resource)
+        if cached_episode:
+            return cached_episode
 
         episode: Episode
         episode_reference = self.source.relative_path(
@@ -247,9 +245,9 @@ class StationProcessor:
         episode_data = None
         if episode_bytes is not None:
             try:
-                episode_str = episode_bytes.decode("utf-8")
-                episode_data = json.loads(episode_str)
-            except json.JSONDecodeError as e:
+                # orjson decodes the bytes directly; no intermediate str.
+                episode_data = orjson.loads(episode_bytes)
+            except orjson.JSONDecodeError as e:
                 logger.error(
                     "Error decoding JSON for episode %s: %s", resource.url, e)
                 return None
@@ -304,8 +302,10 @@ class StationProcessor:
                 media_url=media_url,
                 uuid=utils.extract_uuid(episode_data.get("uuid")),
                 show_uuid=utils.extract_uuid(episode_data.get("show_uuid")),
-                hosts=[utils.extract_uuid(item.get("uuid"))
-                       for item in episode_data.get("hosts", [])],
+                # Drop repeated hosts as they are read, keeping order.
+                hosts=utils.uniq_uuids(
+                    utils.extract_uuid(item.get("uuid"))
+                    for item in episode_data.get("hosts", [])),
                 description=episode_data.get("html_description"),
                 songlist=episode_data.get("songlist"),
                 image=episode_data.get("image"),
@@ -349,10 +349,30 @@ class StationProcessor:
                 socials=show_data.get("properties", {}).get("sameAs", []),
                 type=author_data.get("type"),
             ))
-        hosts = utils.uniq_by_uuid(hosts)
+        # A show page names a single author, so there is nothing to dedup.
         for host in hosts:
-            if host not in self.catalog.list_hosts():
+            if not self.catalog.has_host(host.uuid):
                 self.catalog.add_host(host)
         if logger.isEnabledFor(TRACE_LEVEL_NUM):
             logger.trace("hosts: %s", pprint.pformat(hosts))
         return hosts
+
+
+def _extract_show_items(html: bytes, base_url: str) -> List[dict]:
+    """Extract the microdata items matched by SHOW_ITEMS_XPATH, in document
+    order, as extruct.extract(..., syntaxes=["microdata"]) would."""
+    tree = parse_html(html, encoding="UTF-8")
+    return [MICRODATA_EXTRACTOR.extract_items(node, base_url)[0]
+            for node in SHOW_ITEMS_XPATH(tree)]
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_episode_url(url: str) -> bool:
+    """Classify a URL as an episode. Pure function of the URL, and the same
+    resource is classified several times over an update (enrich, associate,
+    merge), so cache the answer."""
+    # Use the regex on the path portion. The scheme and host can't contain
+    # "/music/shows/", so cutting off the query and fragment is enough and
+    # much cheaper than a full urlparse.
+    path = url.partition("?")[0].partition("#")[0]
+    return EPISODE_URL_REGEX.search(path) is not None
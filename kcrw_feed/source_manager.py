@@ -2,16 +2,19 @@
 
 from abc import ABC, abstractmethod
 from datetime import timedelta
+import functools
 import logging
 import gzip
 import os
 import re
-from urllib.parse import urljoin, urlparse, urlunparse
+import threading
+from urllib.parse import urljoin, urlparse
 import random
 import requests_cache
 import time
 from typing import Dict, Optional, Any
 import fsspec
+from fsspec.utils import infer_compression
 
 
 from kcrw_feed.persistence.logger import TRACE_LEVEL_NUM
@@ -37,6 +40,9 @@ def random_delay(config: Dict[str, Any]) -> None:
     time.sleep(delay)
 
 
+# Both helpers below are pure functions of their arguments and are called
+# for every sitemap location and episode media URL, with few distinct bases.
+@functools.lru_cache(maxsize=8192)
 def normalize_location(base: str, loc: str) -> str:
     """Normalize a relative location by joining it with a base.
 
@@ -50,22 +56,43 @@ def normalize_location(base: str, loc: str) -> str:
     Returns:
         str: The normalized URL or file path."""
     if base.startswith("http://") or base.startswith("https://"):
+        # Fast path for the shape relative_path() produces: an absolute
+        # path ("/music/shows/...") replaces everything after the origin.
+        # Anything with dot segments or a network path goes to urljoin.
+        if loc.startswith("/") and not loc.startswith("//") and "/." not in loc:
+            start = base.index("://") + 3
+            end = len(base)
+            for delim in "/?#":
+                i = base.find(delim, start)
+                if i != -1 and i < end:
+                    end = i
+            return base[:end] + loc
         return urljoin(base, loc)
     else:
         rel = loc.lstrip(os.sep)
         return os.path.normpath(os.path.join(base, rel))
 
 
+@functools.lru_cache(maxsize=16384)
 def strip_query_params(url: str) -> str:
-    parsed = urlparse(url)
-    stripped = parsed._replace(query="")
-    return urlunparse(stripped)
+    # Slice the query out directly rather than urlparse/urlunparse it. Only
+    # a "?" before the fragment starts a query.
+    fragment = url.find("#")
+    if fragment == -1:
+        fragment = len(url)
+    query = url.find("?", 0, fragment)
+    if query == -1:
+        return url
+    return url[:query] + url[fragment:]
 
 
 class BaseSource(ABC):
     """Abstract base class for sources."""
     base_source: str
     _session = None
+    # CachedSession is not thread-safe; guards it and cache_stats when
+    # several workers share one source.
+    _session_lock = threading.Lock()
 
     def __init__(self, config: Dict[str, Any]):
         # Store config for use with random_delay
@@ -113,7 +140,8 @@ class BaseSource(ABC):
 
         If the path is an HTTP URL, it is fetched using the cached session;
         if it ends with '.gz', the content is decompressed.
-        For non-HTTP paths, use fsspec."""
+        Plain local paths (uncompressed or '.gz') are read directly; other
+        non-HTTP paths go through fsspec."""
         logger.debug("Reading: %s", path)
         if path.startswith("http://") or path.startswith("https://"):
             # Disable requests to kcrw.com for now:
@@ -123,8 +151,9 @@ class BaseSource(ABC):
             assert self._session, f"No CachedSession available!"
             try:
                 # Perform the GET request.
-                response = self._session.get(
-                    path, timeout=timeout or self.timeout, headers=self.request_headers)
+                with self._session_lock:
+                    response = self._session.get(
+                        path, timeout=timeout or self.timeout, headers=self.request_headers)
                 # Only raise for status codes other than 404 and 304
                 if response.status_code not in (404, 304):
                     response.raise_for_status()
@@ -138,10 +167,12 @@ class BaseSource(ABC):
                 # Update cache stats based on response.from_cache or 304 status
                 if response.from_cache or response.status_code == 304:
                     logger.info("Cache hit for %s", path)
-                    self.cache_stats["hits"] += 1
+                    with self._session_lock:
+                        self.cache_stats["hits"] += 1
                 else:
                     logger.debug("Cache miss for %s", path)
-                    self.cache_stats["misses"] += 1
+                    with self._session_lock:
+                        self.cache_stats["misses"] += 1
                     # Add detailed cache debugging for misses
                     logger.info("Cache miss details for %s:", path)
                     logger.info("  Status: %d", response.status_code)
@@ -167,7 +198,9 @@ class BaseSource(ABC):
 
                 # For 304 responses, we need to get the content from the cache
                 if response.status_code == 304:
-                    cached_response = self._session.cache.get_response(path)
+                    with self._session_lock:
+                        cached_response = self._session.cache.get_response(
+                            path)
                     if cached_response:
                         content = cached_response.content
                     else:
@@ -183,6 +216,18 @@ class BaseSource(ABC):
             except Exception as e:
                 logger.debug("Error: Could not read data from %s: %s", path, e)
                 return None
+        elif "://" not in path and (compression := infer_compression(path)) in (None, "gzip"):
+            # Local cache files are the common case; skip fsspec's protocol
+            # and filesystem resolution for them.
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                if compression == "gzip":
+                    data = gzip.decompress(data)
+                return data
+            except Exception as e:
+                logger.debug("Error: Could not read data from %s: %s", path, e)
+                return None
         else:
             try:
                 with fsspec.open(path, "rb", timeout=timeout or self.timeout, compression="infer") as f:
@@ -241,9 +286,7 @@ class HttpsSource(BaseSource):
 
     def reference(self, url: str) -> str:
         relative_path = self.relative_path(url)
-        # For HTTP URLs, use urljoin to properly handle the base URL
-        if self.base_source.startswith(("http://", "https://")):
-            return urljoin(self.base_source, relative_path)
+        # normalize_location joins HTTP URLs as urljoin does (and caches)
         return normalize_location(self.base_source, relative_path)
 
 
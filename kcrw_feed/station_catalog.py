@@ -7,6 +7,7 @@ from datetime import datetime
 import logging
 import pprint
 import os
+import threading
 from typing import List, Dict, Any, Optional, Iterable, Callable
 import uuid
 
@@ -35,6 +36,14 @@ class BaseStationCatalog(ABC):
     """
     catalog_source: BaseSource
     catalog: Catalog
+    # Side indexes: resource url -> Show/Episode. Built lazily for the
+    # current self.catalog and kept up to date by add_show/add_episode.
+    # Enrichment adds entities from worker threads, so building an index
+    # and updating one are serialized by _index_lock.
+    _index_lock = threading.Lock()
+    _indexed_catalog: Optional[Catalog] = None
+    _shows_by_resource: Dict[str, Show]
+    _episodes_by_resource: Dict[str, Episode]
 
     @abstractmethod
     def load(self) -> Catalog:
@@ -87,12 +96,47 @@ class BaseStationCatalog(ABC):
     def has_episode(self, episode_id: uuid.UUID | str) -> bool:
         return episode_id in self.catalog.episodes
 
+    def has_host(self, host_id: uuid.UUID | str) -> bool:
+        return host_id in self.catalog.hosts
+
     def get_resource(self, url: str) -> Optional[Resource]:
         return self.catalog.resources.get(url, None)
 
     def get_show(self, show_id: uuid.UUID | str) -> Optional[Show]:
         return self.catalog.shows.get(show_id, None)
 
+    def get_show_by_resource(self, resource: Resource) -> Optional[Show]:
+        """Return the show backed by the given resource, if we have it."""
+        self._build_resource_indexes()
+        return self._shows_by_resource.get(resource.url, None)
+
+    def get_episode_by_resource(self, resource: Resource) -> Optional[Episode]:
+        """Return the episode backed by the given resource, if we have it."""
+        self._build_resource_indexes()
+        return self._episodes_by_resource.get(resource.url, None)
+
+    def _build_resource_indexes(self) -> None:
+        """Index shows and episodes by resource url, unless the indexes are
+        already current for self.catalog."""
+        with self._index_lock:
+            if self._indexed_catalog is self.catalog:
+                return
+            self._shows_by_resource = {
+                show.resource.url: show
+                for show in self.catalog.shows.values() if show.resource}
+            self._episodes_by_resource = {
+                episode.resource.url: episode
+                for episode in self.catalog.episodes.values() if episode.resource}
+            self._indexed_catalog = self.catalog
+
+    def _update_resource_index(self, index: Dict[str, Any], previous: Optional[Show | Episode], entity: Show | Episode) -> None:
+        """Keep a resource index in step with an add/replace."""
+        if previous is not None and previous.resource:
+            if index.get(previous.resource.url) is previous:
+                del index[previous.resource.url]
+        if entity.resource:
+            index[entity.resource.url] = entity
+
     def add_resource(self, resource: Resource) -> None:
         """Add a resource to the catalog."""
         if not resource.url:
@@ -103,13 +147,23 @@ class BaseStationCatalog(ABC):
         """Add a show to the catalog."""
         if show.uuid is None:
             raise ValueError("Show must have a uuid")
-        self.catalog.shows[show.uuid] = show
+        with self._index_lock:
+            previous = self.catalog.shows.get(show.uuid)
+            self.catalog.shows[show.uuid] = show
+            if self._indexed_catalog is self.catalog:
+                self._update_resource_index(
+                    self._shows_by_resource, previous, show)
 
     def add_episode(self, episode: Episode) -> None:
         """Add an episode to the catalog."""
         if episode.uuid is None:
             raise ValueError("Episode must have a uuid")
-        self.catalog.episodes[episode.uuid] = episode
+        with self._index_lock:
+            previous = self.catalog.episodes.get(episode.uuid)
+            self.catalog.episodes[episode.uuid] = episode
+            if self._indexed_catalog is self.catalog:
+                self._update_resource_index(
+                    self._episodes_by_resource, previous, episode)
 
     def add_host(self, host: Host) -> None:
         """Add a host to the catalog."""
@@ -230,9 +284,10 @@ class LiveStationCatalog(BaseStationCatalog):
     """LiveStationCatalog represents collection of shows, episodes, and hosts
     from the live state (kcrw.com)."""
 
-    def __init__(self, catalog_source: BaseSource) -> None:
+    def __init__(self, catalog_source: BaseSource, max_workers: int = 1) -> None:
         self.catalog_source = catalog_source
-        self.resource_processor = ResourceProcessor(self.catalog_source)
+        self.resource_processor = ResourceProcessor(
+            self.catalog_source, max_workers=max_workers)
         self.catalog = self.load()
 
     def load(self) -> Catalog:
@@ -270,21 +325,29 @@ def _filter_items(
     Returns:
       A list of items that match both criteria.
     """
-    items = list(items)
-    if filter_opts:
-        # Apply regex filtering if a compiled regex exists.
-        if filter_opts.compiled_match:
-            pattern = filter_opts.compiled_match
-            if key:
-                items = [item for item in items if pattern.search(key(item))]
-            else:
-                items = [item for item in items if pattern.search(str(item))]
-        # Apply date filtering if a date_key is provided.
-        if date_key:
-            if filter_opts.start_date:
-                items = [item for item in items
-                         if (date_key(item) is not None and date_key(item) >= filter_opts.start_date)]
-            if filter_opts.end_date:
-                items = [item for item in items
-                         if (date_key(item) is not None and date_key(item) <= filter_opts.end_date)]
-    return items
+    if not filter_opts:
+        return list(items)
+    pattern = filter_opts.compiled_match
+    start_date = filter_opts.start_date if date_key else None
+    end_date = filter_opts.end_date if date_key else None
+    if not (pattern or start_date or end_date):
+        return list(items)
+    search = pattern.search if pattern else None
+    match_key = key or str
+
+    # Single pass: regex first (cheap rejection), then the date range, with
+    # date_key evaluated at most once per item.
+    filtered = []
+    for item in items:
+        if search and not search(match_key(item)):
+            continue
+        if start_date or end_date:
+            item_date = date_key(item)
+            if item_date is None:
+                continue
+            if start_date and item_date < start_date:
+                continue
+            if end_date and item_date > end_date:
+                continue
+        filtered.append(item)
+    return filtered
@@ -1,5 +1,6 @@
 """Module to handle updates to the local station catalog."""
 
+from concurrent.futures import ThreadPoolExecutor
 import copy
 import logging
 import pprint
@@ -15,10 +16,12 @@ logger = logging.getLogger("kcrw_feed")
 class CatalogUpdater:
     """Class that implements the station catalog updater."""
 
-    def __init__(self, local_catalog: BaseStationCatalog, live_catalog: BaseStationCatalog, filter_opts: Optional[FilterOptions] = None) -> None:
+    def __init__(self, local_catalog: BaseStationCatalog, live_catalog: BaseStationCatalog, filter_opts: Optional[FilterOptions] = None, max_workers: int = 1) -> None:
         self.local_catalog = local_catalog
         self.live_catalog = live_catalog
         self.filter_opts = filter_opts
+        # Number of resources to enrich concurrently
+        self.max_workers = max(1, max_workers)
 
         # Convenience bool
         self.dry_run = False
@@ -73,19 +76,24 @@ class CatalogUpdater:
 
     def _enrich_resources(self, resources: List[Resource], checkpoint: int = 6) -> Set[Union[Show, Episode]]:
         """Accept resources and return a set of Show and/or Episode objects.
-        Checkpoint by writing state after every n items are enriched."""
-        logger.info("Enriching resources")
+        Checkpoint by writing state after every n items are enriched.
+
+        Fetching is network-bound, so resources are enriched on a pool of
+        max_workers threads. Results are collected (and state checkpointed)
+        here, on the calling thread."""
+        logger.info("Enriching resources (%d workers)", self.max_workers)
         enriched_entities: Set[Union[Show, Episode]] = set()
         count = 1
-        for resource in resources:
-            enriched = self.live_station_processor.process_resource(resource)
-            if enriched:
-                enriched_entities.add(enriched)
-                count += 1
-            if count == checkpoint:
-                if not self.dry_run:
-                    self.local_catalog.save_state()
-                count = 1
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for enriched in executor.map(
+                    self.live_station_processor.process_resource, resources):
+                if enriched:
+                    enriched_entities.add(enriched)
+                    count += 1
+                if count == checkpoint:
+                    if not self.dry_run:
+                        self.local_catalog.save_state()
+                    count = 1
         enriched_entities = self._associate_episodes(enriched_entities)
         return enriched_entities
 
@@ -1,9 +1,10 @@
 """Utility functions"""
 
 from datetime import datetime
+import functools
 import logging
 import re
-from typing import Optional, Sequence
+from typing import Iterable, Optional, Sequence
 from urllib.parse import urljoin, urlparse, urlunparse
 import uuid
 
@@ -11,7 +12,15 @@ from kcrw_feed.models import Episode, Host, Show
 
 logger = logging.getLogger("kcrw_feed")
 
+# This regex matches either a 32-character hex string or a standard UUID with dashes.
+UUID_RE = re.compile(
+    r'([0-9a-fA-F]{32}|[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})'
+)
 
+
+# UUIDs are immutable, so parsed results can be shared. The same ids recur
+# constantly (show_uuid on every episode, host ids on every show/episode).
+@functools.lru_cache(maxsize=8192)
 def extract_uuid(text: str) -> uuid.UUID | None:
     """Extracts and returns the first valid UUID found in the input text.
     The function accepts UUIDs in either the canonical dashed form
@@ -22,11 +31,10 @@ def extract_uuid(text: str) -> uuid.UUID | None:
 
     Returns:
         uuid.UUID: A UUID object if a valid UUID is found; otherwise, None."""
-    # This regex matches either a 32-character hex string or a standard UUID with dashes.
-    pattern = re.compile(
-        r'([0-9a-fA-F]{32}|[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})'
-    )
-    match = pattern.search(text)
+    # Too short to hold even the undashed form; skip the regex.
+    if len(text) < 32:
+        return None
+    match = UUID_RE.search(text)
     if match:
         candidate = match.group(1)
         try:
@@ -43,22 +51,39 @@ def uniq_by_uuid(entities: Sequence[Episode | Host | Show]) -> list[Episode | Ho
 
     Assumes that all items in the list are of the same type, and raises
     an AssertionError if a mixed list is provided."""
-    if entities:
-        first_type = type(entities[0])
-        for e in entities:
-            assert type(
-                e) == first_type, "Mixed types provided to uniq_by_uuid"
-    seen = {}
+    if not entities:
+        return []
+    first_type = type(entities[0])
+    seen: set[uuid.UUID | str] = set()
     deduped = []
     for e in entities:
-        if e.uuid is None:
+        assert type(e) is first_type, "Mixed types provided to uniq_by_uuid"
+        entity_uuid = e.uuid
+        if entity_uuid is None:
             deduped.append(e)
-        elif e.uuid not in seen:
-            seen[e.uuid] = True
+        elif entity_uuid not in seen:
+            seen.add(entity_uuid)
             deduped.append(e)
     return deduped
 
 
+def uniq_uuids(uuids: Iterable[uuid.UUID | None]) -> list[uuid.UUID | None]:
+    """Deduplicate UUIDs, keeping their order. As in uniq_by_uuid, None
+    (an id that couldn't be parsed) is never treated as a duplicate."""
+    seen: set[uuid.UUID] = set()
+    deduped = []
+    for u in uuids:
+        if u is None:
+            deduped.append(u)
+        elif u not in seen:
+            seen.add(u)
+            deduped.append(u)
+    return deduped
+
+
+# datetimes are immutable too, and sitemap lastmod values and episode
+# airdates repeat the same handful of timestamps many times over.
+@functools.lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> Optional[datetime]:
     """Try to parse a date string into a datetime object."""
     if date_str:
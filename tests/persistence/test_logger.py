@@ -147,3 +147,17 @@ def test_non_error_filter():
     # WARNING (30) and ERROR (40) should be filtered out.
     assert non_error_filter.filter(record_warning) is False
     assert non_error_filter.filter(record_error) is False
+
+
+def test_json_formatter_timestamp():
+    """Test that the timestamp matches the record's creation time, including
+    for consecutive records within the same second."""
+    formatter = JSONFormatter()
+    for created in (1735734600.25, 1735734600.5, 1735734601.0):
+        record = logging.LogRecord(
+            "test", logging.INFO, __file__, 1, "msg", (), None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        log_dict = json.loads(formatter.format(record))
+        expected = dt.datetime.fromtimestamp(created, tz=dt.timezone.utc)
+        assert dt.datetime.fromisoformat(log_dict["timestamp"]) == expected
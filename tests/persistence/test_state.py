@@ -81,6 +81,20 @@ def test_episode_from_dict(tmp_path):
         "d4e287b6-2340-41fb-99c3-9bdbac22fd1f")
 
 
+def test_resource_from_dict_shares_loc(tmp_path):
+    js = StatePersister(storage_root=tmp_path, state_file=TEST_FILE)
+    url = "https://www.kcrw.com/music/shows/test-show"
+    data = json.loads(json.dumps({
+        "url": url,
+        "source": url,
+        "last_updated": "2025-01-01T00:00:00",
+        "metadata": {"loc": url, "lastmod": "2025-01-01T00:00:00"},
+    }))
+    resource = js.resource_from_dict(data)
+    assert resource.metadata["loc"] == url
+    assert resource.metadata["loc"] is resource.url
+
+
 def test_show_from_dict(tmp_path):
     js = StatePersister(storage_root=tmp_path, state_file=TEST_FILE)
     dt_str = "2025-01-02T13:45:00"
@@ -221,3 +235,67 @@ def test_save_and_load_state(tmp_path):
     assert loaded_episode.media_url == original_episode.media_url
     assert loaded_episode.description == original_episode.description
     assert loaded_episode.airdate.isoformat() == original_episode.airdate.isoformat()
+
+
+def test_load_catalog_uses_shows_only(tmp_path):
+    """A catalog is rebuilt from its shows; the other collections are not
+    decoded."""
+    fake_filename = tmp_path / TEST_FILE
+    fake_filename.write_text(json.dumps({
+        "type": "catalog",
+        "shows": {
+            "d4e287b6-2340-41fb-99c3-9bdbac22fd1f": {
+                "title": "Show 1",
+                "url": "http://example.com/show1",
+                "image": "https://example.com/big-image",
+                "uuid": "d4e287b6-2340-41fb-99c3-9bdbac22fd1f",
+                "hosts": [
+                    {
+                        "name": "Host 1",
+                        "uuid": "a690aae0-c48d-4771-ac88-0fe13a730b7b"
+                    }
+                ],
+                "resource": {
+                    "url": "http://example.com/show1",
+                    "last_updated": "2025-01-02T13:45:00",
+                    "metadata": {
+                        "lastmod": "2025-01-02T13:45:00"
+                    }
+                }
+            }
+        },
+        # Not valid entities: loading would fail if these were decoded.
+        "episodes": {"bogus": {}},
+        "hosts": {"bogus": {}},
+        "resources": {"bogus": {}}
+    }), encoding="utf-8")
+    persister = StatePersister(storage_root=str(tmp_path),
+                               state_file=TEST_FILE)
+
+    catalog = persister.load(str(fake_filename))
+    show_uuid = uuid.UUID("d4e287b6-2340-41fb-99c3-9bdbac22fd1f")
+    assert list(catalog.shows) == [show_uuid]
+    assert catalog.shows[show_uuid].title == "Show 1"
+    assert list(catalog.hosts) == [
+        uuid.UUID("a690aae0-c48d-4771-ac88-0fe13a730b7b")]
+    assert catalog.episodes == {}
+
+
+def test_serialize_golden_files_round_trip():
+    """Re-serializing the golden state files reproduces them byte for byte:
+    catalog keys sorted at every level, non-ASCII written as \\u escapes."""
+    js = StatePersister(storage_root="tests/data", state_file="kcrw_catalog.json")
+    for filename in ("tests/data/kcrw_catalog.json", "tests/data/kcrw_feed.json"):
+        with open(filename, "rb") as f:
+            golden = f.read()
+        assert js.serialize(js.load(filename)) == golden, filename
+
+
+def test_serialize_escapes_like_json(tmp_path):
+    js = StatePersister(storage_root=tmp_path, state_file=TEST_FILE)
+    text = "café ’quoted’ \U0001f3b8 del\x7f"
+    show = Show(title=text, url="https://www.kcrw.com/music/shows/x")
+    encoded = js.serialize(ShowDirectory(shows=[show]))
+    assert encoded.isascii()
+    assert json.dumps(text)[1:-1].encode() in encoded
+    assert json.loads(encoded)["shows"][0]["title"] == text
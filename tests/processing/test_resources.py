@@ -3,24 +3,36 @@
 import pytest
 from datetime import datetime
 from typing import Optional
-from kcrw_feed.processing.resources import ResourceProcessor, ROBOTS_FILE, MUSIC_FILTER_RE, SITEMAP_RE
+from kcrw_feed.processing.resources import ResourceProcessor, ROBOTS_FILE, SITEMAP_RE, is_music_url
 from kcrw_feed import source_manager
+from kcrw_feed.processing import resources
 
+# Expected results, shared across tests.
+ROBOTS_SITEMAPS = frozenset({
+    "https://www.testsite.com/sitemap1.xml",
+    "https://www.testsite.com/sitemap2.xml",
+})
+CHILD_SITEMAPS = frozenset({
+    "https://www.testsite.com/music/shows/sitemap-child1.xml",
+    "https://www.testsite.com/music/shows/sitemap-child2.xml",
+})
+MUSIC_SHOW_URLS = frozenset({
+    "https://www.testsite.com/music/shows/show1",
+    "https://www.testsite.com/music/shows/show2",
+    "https://www.testsite.com/music/shows/show3",
+})
 
-def fake_get_file(path: str, timeout: int = 10) -> Optional[bytes]:
-    """Fake get_file function to simulate file retrieval."""
-    if path == "https://www.testsite.com/robots.txt":
-        content = (
-            "User-agent: *\n"
-            "Disallow: /private/\n"
-            "Sitemap: https://www.testsite.com/sitemap1.xml\n"
-            "Sitemap: https://www.testsite.com/sitemap2.xml\n"
-        )
-        return content.encode("utf-8")
-    elif path == "https://www.testsite.com/sitemap1.xml":
-        # This sitemap contains two <url> entries:
-        # one for a music show and one for another URL.
-        content = """<?xml version="1.0" encoding="UTF-8"?>
+
+# Payloads as served, encoded once at import.
+ROBOTS_TXT = (
+    "User-agent: *\n"
+    "Disallow: /private/\n"
+    "Sitemap: https://www.testsite.com/sitemap1.xml\n"
+    "Sitemap: https://www.testsite.com/sitemap2.xml\n"
+).encode("utf-8")
+# This sitemap contains two <url> entries:
+# one for a music show and one for another URL.
+SITEMAP1_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
   <url>
     <loc>https://www.testsite.com/music/shows/show1</loc>
@@ -30,26 +42,34 @@ def fake_get_file(path: str, timeout: int = 10) -> Optional[bytes]:
     <loc>https://www.testsite.com/other/url</loc>
   </url>
 </urlset>"""
-        return content.encode("utf-8")
-    elif path == "https://www.testsite.com/sitemap2.xml":
-        content = """<?xml version="1.0" encoding="UTF-8"?>
+SITEMAP2_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
   <url>
     <loc>https://www.testsite.com/music/shows/show2</loc>
     <changefreq>weekly</changefreq>
   </url>
 </urlset>"""
-        return content.encode("utf-8")
-    elif path == "https://www.testsite.com/extra-sitemap.xml":
-        content = """<?xml version="1.0" encoding="UTF-8"?>
+EXTRA_SITEMAP_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
   <url>
     <loc>https://www.testsite.com/music/shows/show3</loc>
     <priority>0.8</priority>
   </url>
 </urlset>"""
-        return content.encode("utf-8")
-    return None
+
+
+# Files served by fake_get_file, by exact path.
+FAKE_FILES = {
+    "https://www.testsite.com/robots.txt": ROBOTS_TXT,
+    "https://www.testsite.com/sitemap1.xml": SITEMAP1_XML,
+    "https://www.testsite.com/sitemap2.xml": SITEMAP2_XML,
+    "https://www.testsite.com/extra-sitemap.xml": EXTRA_SITEMAP_XML,
+}
+
+
+def fake_get_file(path: str, timeout: int = 10) -> Optional[bytes]:
+    """Fake get_file function to simulate file retrieval."""
+    return FAKE_FILES.get(path)
 
 
 class DummySource:
@@ -82,30 +102,118 @@ def patch_get_file(monkeypatch):
     monkeypatch.setattr(source_manager.BaseSource, "_get_file", fake_get_file)
 
 
+def test_is_music_url():
+    """Test that is_music_url matches MUSIC_FILTER_PATHS in any case."""
+    for url, expected in [
+        ("https://www.testsite.com/music/shows/show1", True),
+        ("https://www.testsite.com/MUSIC/Shows/show1", True),
+        ("https://www.testsite.com/sitemap-shows/music/sitemap.xml", True),
+        ("https://www.testsite.com/other/url", False),
+        ("https://www.testsite.com/news/shows/show1", False),
+    ]:
+        assert is_music_url(url) is expected, url
+
+
+def test_mentions_music():
+    """Test that the raw-bytes screen finds music paths in any case."""
+    for payload, expected in [
+        (b"<loc>https://www.testsite.com/music/shows/show1</loc>", True),
+        (b"<loc>https://www.testsite.com/MUSIC/Shows/show1</loc>", True),
+        (b"<loc>https://www.testsite.com/sitemap-shows/music/x.xml</loc>", True),
+        (b"<loc>https://www.testsite.com/news/shows/show1</loc>", False),
+    ]:
+        assert resources._mentions_music(payload) is expected, payload
+
+
 def test_sitemaps_from_robots(dummy_source):
     """
     Test that _sitemaps_from_robots() correctly reads robots.txt.
     """
     processor = ResourceProcessor(dummy_source)
     sitemap_urls = processor._sitemaps_from_robots()
-    expected = {"https://www.testsite.com/sitemap1.xml",
-                "https://www.testsite.com/sitemap2.xml"}
-    assert set(sitemap_urls) == expected
+    assert frozenset(sitemap_urls) == ROBOTS_SITEMAPS
 
 
-def test_read_sitemap_for_entries(dummy_source):
+def test_ingest_sitemap_entries(dummy_source):
     """
-    Test that _read_sitemap_for_entries() parses a sitemap XML file and stores
-    only music show entries in _sitemap_entities.
+    Test that _ingest_sitemap_entries() parses a sitemap XML file and stores
+    only music show entries in _resources.
     """
+    sitemap = "https://www.testsite.com/sitemap1.xml"
     processor = ResourceProcessor(dummy_source)
-    processor._read_sitemap_for_entries(
-        "https://www.testsite.com/sitemap1.xml")
+    processor._ingest_sitemap_entries(
+        sitemap, dummy_source.get_reference(sitemap))
     # From sitemap1.xml, only the URL containing "/music/shows/" should be stored.
     assert "https://www.testsite.com/music/shows/show1" in processor._resources
     assert "https://www.testsite.com/other/url" not in processor._resources
 
 
+def test_ingest_sitemap_entries_metadata(dummy_source):
+    """
+    Test that sitemap entries keep their namespaced children as metadata and
+    that an unparseable sitemap is skipped.
+    """
+    sitemap_xml = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url>
+    <loc>https://www.testsite.com/music/shows/show1</loc>
+    <lastmod>2025-01-01T00:00:00</lastmod>
+    <priority>0.8</priority>
+    <image:image>
+      <image:loc>https://www.testsite.com/show1.jpg</image:loc>
+    </image:image>
+  </url>
+</urlset>"""
+    processor = ResourceProcessor(dummy_source)
+    processor._ingest_sitemap_entries(
+        "https://www.testsite.com/sitemap-image.xml", sitemap_xml.encode("utf-8"))
+    resource = processor._resources["https://www.testsite.com/music/shows/show1"]
+    assert resource.metadata == {
+        "loc": "https://www.testsite.com/music/shows/show1",
+        "lastmod": datetime(2025, 1, 1),
+        "priority": "0.8",
+        "image:image": {"image:loc": "https://www.testsite.com/show1.jpg"},
+    }
+
+    processor._ingest_sitemap_entries(
+        "https://www.testsite.com/sitemap-broken.xml",
+        b"<urlset><url><loc>truncated")
+    assert len(processor._resources) == 1
+
+
+def test_ingest_sitemap_entries_truncated(dummy_source):
+    """Test that a sitemap which breaks off after some complete entries
+    contributes none of them."""
+    truncated = (
+        b"<urlset>"
+        b"<url><loc>https://www.testsite.com/music/shows/show1</loc></url>"
+        b"<url><loc>https://www.testsite.com/music/shows/sh"
+    )
+    processor = ResourceProcessor(dummy_source)
+    processor._ingest_sitemap_entries(
+        "https://www.testsite.com/sitemap-truncated.xml", truncated)
+    assert processor._resources == {}
+
+
+def test_read_sitemap_without_music_is_not_parsed(dummy_source, monkeypatch):
+    """Test that a sitemap whose bytes never mention a music path is
+    skipped before any XML parsing."""
+    def fail_iter_entries(*args, **kwargs):
+        raise AssertionError("sitemap should not have been parsed")
+    monkeypatch.setattr(resources, "_iter_entries", fail_iter_entries)
+    dummy_source.get_reference = lambda path: (
+        b"<urlset><url><loc>https://www.testsite.com/news/shows/x</loc></url>"
+        b"</urlset>")
+    processor = ResourceProcessor(dummy_source)
+    processor._ingest_sitemap_entries(
+        "https://www.testsite.com/sitemap-news.xml",
+        dummy_source.get_reference("https://www.testsite.com/sitemap-news.xml"))
+    assert processor._resources == {}
+    assert processor._read_sitemap_for_child_sitemaps(
+        "https://www.testsite.com/sitemap-news.xml") == []
+
+
 def test_read_sitemap_for_child_sitemaps(dummy_source):
     """
     Test that _read_sitemap_for_child_sitemaps() extracts child sitemap URLs from a sitemap index.
@@ -131,13 +239,32 @@ def test_read_sitemap_for_child_sitemaps(dummy_source):
     processor = ResourceProcessor(dummy_source)
     child_sitemaps = processor._read_sitemap_for_child_sitemaps(
         "https://www.testsite.com/sitemap-index.xml")
-    # Additionally, the processor filters child sitemaps with MUSIC_FILTER_RE.
-    # For testing, if MUSIC_FILTER_RE does not match these URLs, child_sitemaps might be empty.
-    # Let's assume that for the test, MUSIC_FILTER_RE is not filtering these.
-    expected = {"https://www.testsite.com/music/shows/sitemap-child1.xml",
-                "https://www.testsite.com/music/shows/sitemap-child2.xml"}
+    # Additionally, the processor filters child sitemaps with is_music_url.
+    # For testing, if is_music_url does not match these URLs, child_sitemaps might be empty.
+    # Let's assume that for the test, is_music_url is not filtering these.
     # We compare as sets.
-    assert set(child_sitemaps) == expected
+    assert frozenset(child_sitemaps) == CHILD_SITEMAPS
+
+
+def test_collect_sitemaps_nested(dummy_source):
+    """Test that sitemap indexes are followed to any depth, and that a cycle
+    back to an already seen sitemap does not loop."""
+    base = "https://www.testsite.com/music/shows/"
+
+    def index(*children: str) -> bytes:
+        entries = "".join(
+            f"<sitemap><loc>{base}{child}</loc></sitemap>" for child in children)
+        return f"<sitemapindex>{entries}</sitemapindex>".encode("utf-8")
+    pages = {
+        base + "sitemap-a.xml": index("sitemap-b.xml"),
+        base + "sitemap-b.xml": index("sitemap-c.xml", "sitemap-a.xml"),
+        base + "sitemap-c.xml": b"<urlset></urlset>",
+    }
+    dummy_source.get_reference = pages.get
+    for max_workers in (1, 4):
+        processor = ResourceProcessor(dummy_source, max_workers=max_workers)
+        collected = processor._collect_sitemaps([base + "sitemap-a.xml"])
+        assert collected == pages.keys()
 
 
 def test_fetch_resources(dummy_source, monkeypatch):
@@ -156,39 +283,50 @@ def test_fetch_resources(dummy_source, monkeypatch):
     monkeypatch.setattr(processor, "_sitemaps_from_robots",
                         fake_sitemaps_from_robots)
     urls = processor.fetch_resources()
-    expected = {
-        "https://www.testsite.com/music/shows/show1",
-        "https://www.testsite.com/music/shows/show2",
-        "https://www.testsite.com/music/shows/show3",
-    }
-    assert set(urls) == expected
+    assert MUSIC_SHOW_URLS == urls.keys()
 
 
-# def test_get_all_entries(dummy_source):
-#     """Test that get_all_entries() returns all stored sitemap entry
-#     dictionaries."""
-#     processor = SitemapProcessor(dummy_source)
-#     # Preload fake entries.
-#     processor._source_entities = {
-#         "https://www.testsite.com/music/shows/show1": {
-#             "loc": "https://www.testsite.com/music/shows/show1",
-#             "lastmod": "2025-01-01T00:00:00"
-#         },
-#         "https://www.testsite.com/music/shows/show2": {
-#             "loc": "https://www.testsite.com/music/shows/show2",
-#             "lastmod": "2025-02-01T00:00:00"
-#         }
-#     }
-#     entries = processor.get_all_entries()
-#     expected = [
-#         {"loc": "https://www.testsite.com/music/shows/show1",
-#             "lastmod": "2025-01-01T00:00:00"},
-#         {"loc": "https://www.testsite.com/music/shows/show2",
-#             "lastmod": "2025-02-01T00:00:00"},
-#     ]
-#     # Use frozenset for unordered comparison.
-#     assert {frozenset(entry.items()) for entry in entries} == {
-#         frozenset(entry.items()) for entry in expected}
+def test_fetch_resources_reads_each_sitemap_once(dummy_source, monkeypatch):
+    """Test that sitemaps read while collecting child sitemaps are not
+    fetched again when reading their entries."""
+    fetched = []
+
+    def counting_get_reference(path: str) -> Optional[bytes]:
+        fetched.append(path)
+        return fake_get_file(dummy_source.reference(path))
+    monkeypatch.setattr(dummy_source, "get_reference", counting_get_reference)
+    processor = ResourceProcessor(dummy_source)
+    assert processor.fetch_resources()
+    assert len(fetched) == len(set(fetched))
+    # The bytes only live for one crawl; a second crawl fetches afresh.
+    assert processor._sitemap_bytes == {}
+    first_crawl = list(fetched)
+    assert processor.fetch_resources()
+    assert fetched == first_crawl + first_crawl
+
+
+def test_fetch_resources_concurrent(dummy_source):
+    """Test that fetching sitemaps with several workers finds the same shows
+    as fetching them one at a time."""
+    serial = ResourceProcessor(dummy_source).fetch_resources()
+    concurrent = ResourceProcessor(dummy_source, max_workers=4).fetch_resources()
+    assert serial.keys() == concurrent.keys()
+
+
+def test_get_all_entries(dummy_source):
+    """Test that fetch_resources() keeps every music sitemap entry as its
+    Resource's metadata."""
+    found = ResourceProcessor(dummy_source).fetch_resources()
+    entries = [resource.metadata for resource in found.values()]
+    expected = [
+        {"loc": "https://www.testsite.com/music/shows/show1",
+            "lastmod": datetime(2025, 1, 1)},
+        {"loc": "https://www.testsite.com/music/shows/show2",
+            "changefreq": "weekly"},
+    ]
+    # Compare sorted items so unhashable values (nested metadata) work.
+    assert sorted(sorted(entry.items()) for entry in entries) == sorted(
+        sorted(entry.items()) for entry in expected)
 
 
 # def test_get_entries_after(dummy_source):
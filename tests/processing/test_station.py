@@ -1,6 +1,7 @@
 """Module to test the processing of Shows."""
 
 import pytest
+import extruct
 import tempfile
 import json
 import uuid
@@ -8,7 +9,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from kcrw_feed.models import Show, Episode, Resource
-from kcrw_feed.processing.station import StationProcessor
+from kcrw_feed.processing.station import StationProcessor, _extract_show_items
 from kcrw_feed import source_manager
 
 # Fake microdata HTML for a Show page.
@@ -61,6 +62,11 @@ FAKE_EPISODE_JSON: Dict[str, Any] = {
     "modified": "2025-04-01T12:05:00"
 }
 
+# Payloads as served, encoded once at import.
+FAKE_SHOW_HTML_BYTES = FAKE_SHOW_HTML.encode("utf-8")
+FAKE_EPISODE_HTML_BYTES = FAKE_EPISODE_HTML.encode("utf-8")
+FAKE_EPISODE_JSON_BYTES = json.dumps(FAKE_EPISODE_JSON).encode("utf-8")
+
 FAKE_RESOURCE = Resource(
     url="https://www.testsite.com/music/shows/test-show/foo",
     source="https://www.testsite.com/music/shows/test-show/foo",
@@ -101,6 +107,18 @@ class FakeCatalog:
     def get_resource(self, url: str) -> Optional[Resource]:
         return self.resources.get(url)
 
+    def get_show_by_resource(self, resource: Resource) -> Optional[Show]:
+        for show in self.shows.values():
+            if show.resource and show.resource == resource:
+                return show
+        return None
+
+    def get_episode_by_resource(self, resource: Resource) -> Optional[Episode]:
+        for episode in self.episodes.values():
+            if episode.resource and episode.resource == resource:
+                return episode
+        return None
+
 # DummySource from your tests.
 
 
@@ -119,31 +137,33 @@ class DummySource:
         return url
 
 
+# Pages served by fake_get_file, by exact URL. Anything else is served the
+# show page.
+FAKE_PAGES = {
+    "https://www.testsite.com/music/shows/test-show/test-episode": FAKE_EPISODE_HTML_BYTES,
+    "https://www.testsite.com/music/shows/test-show": FAKE_SHOW_HTML_BYTES,
+}
+
+
 def fake_get_file(url: str) -> Any:
     """Return content based on resource signature."""
     # For episode player JSON.
     if url.endswith("player.json"):
-        return json.dumps(FAKE_EPISODE_JSON).encode("utf-8")
-    # If URL indicates an episode page.
-    if "test-episode" in url:
-        return FAKE_EPISODE_HTML.encode("utf-8")
-    # If URL indicates a show page.
-    if "test-show" in url:
-        return FAKE_SHOW_HTML.encode("utf-8")
-    return FAKE_SHOW_HTML.encode("utf-8")
-
-
-@pytest.fixture(name="fake_processor")
-def fake_processor_fixture(monkeypatch: pytest.MonkeyPatch) -> StationProcessor:
-    """Create a StationProcessor using a FakeCatalog.
-    Monkeypatch the instance of DummySource's _get_file method to return predetermined content.
+        return FAKE_EPISODE_JSON_BYTES
+    return FAKE_PAGES.get(url, FAKE_SHOW_HTML_BYTES)
+
+
+@pytest.fixture(name="fake_processor", scope="module")
+def fake_processor_fixture() -> StationProcessor:
+    """Create a StationProcessor using a FakeCatalog, once per module.
+    The DummySource instance serves predetermined content via fake_get_file.
     """
     fake_catalog = FakeCatalog()
     # Create an instance of DummySource.
     dummy_source = DummySource("https://www.testsite.com/")
-    # Patch the instance's _get_file method.
-    # monkeypatch.setattr(dummy_source, '_get_file', fake_get_file)
-    monkeypatch.setattr(dummy_source, 'get_reference', fake_get_file)
+    # Override get_reference on this instance only: there is no global
+    # state to restore afterwards, so no monkeypatch is needed.
+    dummy_source.get_reference = fake_get_file
     # Use this dummy_source in your catalog.
     fake_catalog.source = dummy_source
 
@@ -152,6 +172,15 @@ def fake_processor_fixture(monkeypatch: pytest.MonkeyPatch) -> StationProcessor:
     return sp
 
 
+@pytest.fixture(autouse=True)
+def reset_fake_catalog(fake_processor: StationProcessor) -> None:
+    """Start every test with an empty catalog, so nothing enriched by one test
+    is served from cache in the next."""
+    fake_processor.catalog.shows.clear()
+    fake_processor.catalog.episodes.clear()
+    fake_processor.catalog.resources.clear()
+
+
 def test_process_show(fake_processor: StationProcessor):
     """Test that process_resource() returns a Show object when given a
     show URL."""
@@ -173,6 +202,22 @@ def test_process_show(fake_processor: StationProcessor):
     assert result.description == "A description of the test show."
 
 
+def test_extract_show_items_matches_extruct():
+    """Test that the scoped microdata extraction returns the same RadioSeries
+    and episode list items as a full extruct pass over a real show page."""
+    base_url = "https://www.kcrw.com/music/shows/henry-rollins"
+    with open("tests/data/music/shows/henry-rollins/index.html", "rb") as f:
+        html = f.read()
+    full = extruct.extract(html, base_url=base_url, syntaxes=["microdata"])
+    expected = [
+        item for item in full["microdata"]
+        if item.get("type") == "http://schema.org/RadioSeries"
+        or item.get("id", "").endswith("-episodes")
+    ]
+    assert expected
+    assert _extract_show_items(html, base_url) == expected
+
+
 def test_process_episode(fake_processor: StationProcessor):
     """Test that process_resource() returns an Episode object when given
     an episode URL."""
@@ -194,6 +239,62 @@ def test_process_episode(fake_processor: StationProcessor):
     assert result.airdate == expected_date
 
 
+def test_process_episode_dedups_hosts(fake_processor: StationProcessor, monkeypatch):
+    """Test that a host listed twice in player.json is kept only once."""
+    host_uuid = "5883da63-a527-de85-856a-5c05e27331b8"
+    episode_json = dict(FAKE_EPISODE_JSON,
+                        hosts=[{"uuid": host_uuid}, {"uuid": host_uuid}])
+    episode_json_bytes = json.dumps(episode_json).encode("utf-8")
+    monkeypatch.setattr(fake_processor.source, "get_reference",
+                        lambda path: episode_json_bytes)
+    url = "https://www.testsite.com/music/shows/test-show/test-episode"
+    resource = Resource(
+        url=url,
+        source=url,
+        last_updated=datetime.now(),
+        metadata={"lastmod": datetime.now()}
+    )
+    result = fake_processor.process_resource(resource)
+    assert result.hosts == [uuid.UUID(host_uuid)]
+
+
+def test_process_episode_keeps_unparsed_hosts(fake_processor: StationProcessor, monkeypatch):
+    """Test that hosts whose id can't be parsed are all kept, as
+    uniq_by_uuid keeps every None UUID."""
+    host_uuid = "5883da63-a527-de85-856a-5c05e27331b8"
+    episode_json = dict(FAKE_EPISODE_JSON,
+                        hosts=[{"uuid": "unknown"}, {"uuid": host_uuid},
+                               {"uuid": "unknown"}, {"uuid": host_uuid}])
+    episode_json_bytes = json.dumps(episode_json).encode("utf-8")
+    monkeypatch.setattr(fake_processor.source, "get_reference",
+                        lambda path: episode_json_bytes)
+    url = "https://www.testsite.com/music/shows/test-show/test-episode"
+    resource = Resource(
+        url=url,
+        source=url,
+        last_updated=datetime.now(),
+        metadata={"lastmod": datetime.now()}
+    )
+    result = fake_processor.process_resource(resource)
+    assert result.hosts == [None, uuid.UUID(host_uuid), None]
+
+
+def test_is_episode_resource(fake_processor: StationProcessor):
+    """Test that only URLs with a second path segment after /music/shows/
+    are classified as episodes; the query and fragment don't count."""
+    cases = {
+        "https://www.testsite.com/music/shows/test-show": False,
+        "https://www.testsite.com/music/shows/test-show/": False,
+        "https://www.testsite.com/music/shows/test-show/test-episode": True,
+        "https://www.testsite.com/music/shows/test-show?next=/a/b": False,
+        "https://www.testsite.com/music/shows/test-show#/a": False,
+        "https://www.testsite.com/search?q=/music/shows/a/b": False,
+    }
+    for url, expected in cases.items():
+        resource = Resource(url=url, source=url, last_updated=None)
+        assert fake_processor.is_episode_resource(resource) is expected, url
+
+
 def test_process_invalid_structure_falls_back_to_show(fake_processor: StationProcessor):
     """Test that an invalid URL structure falls back to treating it as a Show."""
     url = "https://www.testsite.com/invalid/path"
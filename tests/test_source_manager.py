@@ -5,12 +5,17 @@ import io
 import gzip
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urljoin
 import pytest
 import fsspec
 
 from kcrw_feed import source_manager
 
 
+# The module-wide autouse fixture below patches _get_file; keep the real one.
+REAL_GET_FILE = source_manager.BaseSource._get_file
+
+
 def fake_get_file(self, path: str, timeout: int = 10) -> Optional[bytes]:
     """Fake get_file function to simulate file retrieval."""
     if path.endswith("test.txt"):
@@ -75,6 +80,21 @@ def test_get_file_gzip(tmp_path: Path):
     assert result == test_content
 
 
+def test_real_get_file_local(tmp_path: Path):
+    """The unpatched _get_file reads local paths directly and falls back to
+    fsspec for URLs such as file://."""
+    test_content = b"Hello, local!"
+    plain_file = tmp_path / "sitemap.xml"
+    plain_file.write_bytes(test_content)
+    gz_file = tmp_path / "sitemap.xml.gz"
+    with gzip.open(gz_file, "wb") as f:
+        f.write(test_content)
+    dummy = DummySource(str(tmp_path))
+    for path in (str(plain_file), str(gz_file), plain_file.as_uri()):
+        assert REAL_GET_FILE(dummy, path, timeout=5) == test_content
+    assert REAL_GET_FILE(dummy, str(tmp_path / "missing.xml"), timeout=5) is None
+
+
 def test_get_file_https(monkeypatch: pytest.MonkeyPatch):
     """Simulate an HTTPS file using monkeypatch for fsspec.open."""
     def fake_open(path, mode="rb", timeout=10, compression="infer", headers=None):
@@ -129,6 +149,18 @@ def test_normalize_url_with_directory_and_leading_slash():
     assert result == expected
 
 
+def test_normalize_url_matches_urljoin():
+    bases = ["https://www.testsite.com/", "https://www.testsite.com",
+             "https://www.testsite.com/dir/page?q=1", "http://localhost:8888/"]
+    locs = ["/music/shows/show1", "/music/shows/show1/ep?x=1#top",
+            "/music/./shows/../shows/show1", "//other.com/path",
+            "relative/path", "https://elsewhere.com/x"]
+    for base in bases:
+        for loc in locs:
+            assert source_manager.normalize_location(
+                base, loc) == urljoin(base, loc), (base, loc)
+
+
 def test_normalize_local_path_relative():
     base = "/home/user"
     loc = "documents/report.txt"
@@ -176,6 +208,11 @@ def test_url_with_only_query():
     assert source_manager.strip_query_params(url) == expected
 
 
+def test_url_with_question_mark_in_fragment():
+    url = "https://example.com/path#section?foo=bar"
+    assert source_manager.strip_query_params(url) == url
+
+
 def test_complex_url():
     url = ("https://ondemand-media.kcrw.com/fdd/audio/download/kcrw/music/hr/"
            "KCRW-henry_rollins-kcrw_broadcast_825-250125.mp3?awCollectionId=henry-rollins&"
@@ -1,17 +1,20 @@
 """Tests for the station_catalog module."""
 
-import json
 import os
-# import tempfile
+import re
+import threading
 import uuid
+from collections import defaultdict
 from datetime import datetime
-# from pathlib import Path
-from typing import Dict, List, Any
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+import orjson
 import pytest
 
-from kcrw_feed.models import Show, Episode, Host, Resource, ShowDirectory, Catalog
-from kcrw_feed.station_catalog import BaseStationCatalog, LocalStationCatalog, LiveStationCatalog, STATE_CATALOG_FILE
-from kcrw_feed.source_manager import BaseSource, CacheSource
+from kcrw_feed.models import Show, Episode, Host, Resource, ShowDirectory, Catalog, FilterOptions
+from kcrw_feed.station_catalog import BaseStationCatalog, LocalStationCatalog, STATE_CATALOG_FILE
+from kcrw_feed.source_manager import CacheSource
 from kcrw_feed.persistence.feeds import FeedPersister
 from kcrw_feed.persistence.state import StatePersister
 
@@ -19,57 +22,96 @@ GOLDEN_FILES_DIR = "tests/data"
 DIRECTORY_FILE = "kcrw_feed.json"
 CATALOG_FILE = "kcrw_catalog.json"
 
-# Minimal test config
-TEST_CONFIG: Dict[str, Any] = {
+# Fixed UUIDs keep the mock objects (and any assertion failures) reproducible
+HOST_UUID = uuid.UUID(int=1)
+EPISODE_UUID = uuid.UUID(int=2)
+SHOW_UUID = uuid.UUID(int=3)
+NEW_HOST_UUID = uuid.UUID(int=4)
+NEW_EPISODE_UUID = uuid.UUID(int=5)
+NEW_SHOW_UUID = uuid.UUID(int=6)
+
+# One timestamp for every mock object instead of a datetime.now() per field
+NOW = datetime(2024, 1, 1)
+
+# Minimal test config, read-only so no test can change it for the others
+TEST_CONFIG: Mapping[str, Any] = MappingProxyType({
     "source_root": "https://www.example.com/",
     "storage_root": ".",
     "state_file": CATALOG_FILE,
     "feed_directory": "catalog/feeds",
     "http_timeout": 25,
-    "request_delay": {
+    "request_delay": MappingProxyType({
         "mean": 5.0,
         "stddev": 2.0
-    },
-    "request_headers": {
+    }),
+    "request_headers": MappingProxyType({
         "User-Agent": "Test User Agent"
-    }
-}
+    })
+})
 
 
-class MockSource(BaseSource):
-    """Mock source for testing."""
+class MockFeedPersister(FeedPersister):
+    """Mock feed persister for testing."""
 
-    def __init__(self, resources=None):
-        self.resources = resources or []
-        self.robots_txt_content = "User-agent: *\nAllow: /"
+    def __init__(self):
+        self.saved_shows = []
 
-    def get_reference(self, resource: str) -> bytes | None:
-        return super().get_reference(resource)
+    def save(self, show_directory: ShowDirectory, feed_directory: str = None) -> None:
+        """Record the shows that would be saved."""
+        self.saved_shows = show_directory.shows
 
-    def reference(self, entity_reference: str) -> str:
-        return super().reference(entity_reference)
 
-    def relative_path(self, entity_reference: str) -> str:
-        return super().relative_path(entity_reference)
+def _build_mock_graph() -> Dict[str, ShowDirectory | Catalog]:
+    """Build the object graph MockStatePersister.load serves."""
+    # Create a simple catalog with one show, one episode, and one host
+    host = Host(
+        name="Test Host",
+        uuid=HOST_UUID,
+        title="Test Title",
+        url="https://example.com/host",
+        image="https://example.com/host.jpg",
+        description="Test host description"
+    )
 
-    def fetch_resources(self) -> Dict[str, Resource]:
-        """Return the mock resources."""
-        return {r.url: r for r in self.resources}
+    resource = Resource(
+        url="https://example.com/resource",
+        source="test",
+        last_updated=NOW,
+        metadata={"lastmod": NOW}
+    )
 
-    def get_robots_txt(self):
-        """Return mock robots.txt content."""
-        return self.robots_txt_content
+    episode = Episode(
+        title="Test Episode",
+        airdate=NOW,
+        url="https://example.com/episode",
+        media_url="https://example.com/episode.mp3",
+        uuid=EPISODE_UUID,
+        hosts=[host],
+        description="Test episode description",
+        resource=resource
+    )
 
+    show = Show(
+        title="Test Show",
+        url="https://example.com/show",
+        image="https://example.com/show.jpg",
+        uuid=SHOW_UUID,
+        description="Test show description",
+        hosts=[host],
+        episodes=[episode],
+        last_updated=NOW,
+        resource=resource
+    )
 
-class MockFeedPersister(FeedPersister):
-    """Mock feed persister for testing."""
+    catalog = Catalog()
+    catalog.shows[show.uuid] = show
+    catalog.episodes[episode.uuid] = episode
+    catalog.hosts[host.uuid] = host
+    catalog.resources[resource.url] = resource
+    return {"catalog": catalog, "directory": ShowDirectory(shows=[show])}
 
-    def __init__(self):
-        self.saved_shows = []
 
-    def save(self, show_directory: ShowDirectory, feed_directory: str = None) -> None:
-        """Record the shows that would be saved."""
-        self.saved_shows = show_directory.shows
+_MOCK_GRAPH = _build_mock_graph()
 
 
 class MockStatePersister(StatePersister):
@@ -86,76 +128,30 @@ class MockStatePersister(StatePersister):
         self.saved_filenames.append(filename or self.filename)
 
     def load(self, filename: str = None) -> ShowDirectory | Catalog:
-        """Return a mock catalog for testing."""
-        # Create a simple catalog with one show, one episode, and one host
-        host = Host(
-            name="Test Host",
-            uuid=uuid.uuid4(),
-            title="Test Title",
-            url="https://example.com/host",
-            image="https://example.com/host.jpg",
-            description="Test host description"
-        )
-
-        resource = Resource(
-            url="https://example.com/resource",
-            source="test",
-            last_updated=datetime.now(),
-            metadata={"lastmod": datetime.now()}
-        )
-
-        episode = Episode(
-            title="Test Episode",
-            airdate=datetime.now(),
-            url="https://example.com/episode",
-            media_url="https://example.com/episode.mp3",
-            uuid=uuid.uuid4(),
-            hosts=[host],
-            description="Test episode description",
-            resource=resource
-        )
-
-        show = Show(
-            title="Test Show",
-            url="https://example.com/show",
-            image="https://example.com/show.jpg",
-            uuid=uuid.uuid4(),
-            description="Test show description",
-            hosts=[host],
-            episodes=[episode],
-            last_updated=datetime.now(),
-            resource=resource
-        )
-
+        """Return the shared mock catalog or show directory."""
         # Check if this is a catalog request or a show directory request
         if filename and filename.endswith(STATE_CATALOG_FILE):
-            catalog = Catalog()
-            catalog.shows[show.uuid] = show
-            catalog.episodes[episode.uuid] = episode
-            catalog.hosts[host.uuid] = host
-            catalog.resources[resource.url] = resource
-            return catalog
-        else:
-            return ShowDirectory(shows=[show])
+            return _MOCK_GRAPH["catalog"]
+        return _MOCK_GRAPH["directory"]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_resource():
     """Create a mock resource for testing."""
     return Resource(
         url="https://example.com/resource",
         source="test",
-        last_updated=datetime.now(),
-        metadata={"lastmod": datetime.now()}
+        last_updated=NOW,
+        metadata={"lastmod": NOW}
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_host():
     """Create a mock host for testing."""
     return Host(
         name="Test Host",
-        uuid=uuid.uuid4(),
+        uuid=HOST_UUID,
         title="Test Title",
         url="https://example.com/host",
         image="https://example.com/host.jpg",
@@ -163,40 +159,49 @@ def mock_host():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_episode(mock_host, mock_resource):
     """Create a mock episode for testing."""
     return Episode(
         title="Test Episode",
-        airdate=datetime.now(),
+        airdate=NOW,
         url="https://example.com/episode",
         media_url="https://example.com/episode.mp3",
-        uuid=uuid.uuid4(),
+        uuid=EPISODE_UUID,
         hosts=[mock_host],
         description="Test episode description",
         resource=mock_resource
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_show(mock_host, mock_episode, mock_resource):
     """Create a mock show for testing."""
     return Show(
         title="Test Show",
         url="https://example.com/show",
         image="https://example.com/show.jpg",
-        uuid=uuid.uuid4(),
+        uuid=SHOW_UUID,
         description="Test show description",
         hosts=[mock_host],
         episodes=[mock_episode],
-        last_updated=datetime.now(),
+        last_updated=NOW,
         resource=mock_resource
     )
 
 
+class ConcreteCatalog(BaseStationCatalog):
+    """Minimal concrete catalog that serves whatever catalog it is given."""
+
+    def load(self) -> Catalog:
+        return self.catalog
+
+
 @pytest.fixture
 def mock_catalog(mock_show, mock_episode, mock_host, mock_resource):
-    """Create a mock catalog for testing."""
+    """Create a mock catalog for testing. The entities are built once per
+    module and only read; the Catalog wrapping them is fresh for each test
+    so the add_* tests can't leak into the others."""
     catalog = Catalog()
     catalog.shows[mock_show.uuid] = mock_show
     catalog.episodes[mock_episode.uuid] = mock_episode
@@ -205,100 +210,107 @@ def mock_catalog(mock_show, mock_episode, mock_host, mock_resource):
     return catalog
 
 
+@pytest.fixture
+def concrete_catalog(mock_catalog):
+    """A ConcreteCatalog wrapping the mock catalog."""
+    catalog = ConcreteCatalog()
+    catalog.catalog = mock_catalog
+    return catalog
+
+
 class TestBaseStationCatalog:
     """Tests for the BaseStationCatalog class."""
 
-    def test_list_resources(self, mock_catalog):
+    def test_list_resources(self, concrete_catalog):
         """Test listing resources."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         resources = catalog.list_resources()
         assert len(resources) == 1
         assert resources[0].url == "https://example.com/resource"
 
-    def test_list_shows(self, mock_catalog):
-        """Test listing shows."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
+    def test_list_resources_filtered(self):
+        """Test listing resources filtered by regex and date range."""
         catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog.catalog = Catalog()
+        for url, lastmod in [
+            ("https://example.com/music/shows/a", datetime(2025, 1, 1)),
+            ("https://example.com/music/shows/b", datetime(2025, 2, 1)),
+            ("https://example.com/music/shows/c", datetime(2025, 3, 1)),
+            ("https://example.com/music/shows/d", None),
+            ("https://example.com/news/e", datetime(2025, 2, 1)),
+        ]:
+            catalog.add_resource(Resource(
+                url=url, source=url, last_updated=lastmod,
+                metadata={"lastmod": lastmod}))
+
+        def urls(filter_opts):
+            return sorted(r.url for r in catalog.list_resources(filter_opts))
+
+        assert len(urls(FilterOptions())) == 5
+        assert urls(FilterOptions(compiled_match=re.compile("/music/"))) == [
+            "https://example.com/music/shows/a",
+            "https://example.com/music/shows/b",
+            "https://example.com/music/shows/c",
+            "https://example.com/music/shows/d",
+        ]
+        # Items without a date are excluded once a date bound is set.
+        assert urls(FilterOptions(
+            compiled_match=re.compile("/music/"),
+            start_date=datetime(2025, 1, 15),
+            end_date=datetime(2025, 2, 15))) == [
+            "https://example.com/music/shows/b"]
+        assert urls(FilterOptions(end_date=datetime(2025, 1, 15))) == [
+            "https://example.com/music/shows/a"]
+
+    def test_list_shows(self, concrete_catalog):
+        """Test listing shows."""
+        catalog = concrete_catalog
 
         shows = catalog.list_shows()
         assert len(shows) == 1
         assert shows[0].title == "Test Show"
 
-    def test_list_episodes(self, mock_catalog):
+    def test_list_episodes(self, concrete_catalog):
         """Test listing episodes."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         episodes = catalog.list_episodes()
         assert len(episodes) == 1
         assert episodes[0].title == "Test Episode"
 
-    def test_list_hosts(self, mock_catalog):
+    def test_list_hosts(self, concrete_catalog):
         """Test listing hosts."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         hosts = catalog.list_hosts()
         assert len(hosts) == 1
         assert hosts[0].name == "Test Host"
 
-    def test_has_show(self, mock_catalog, mock_show):
+    def test_has_show(self, concrete_catalog, mock_show):
         """Test checking if a show exists."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         assert catalog.has_show(mock_show.uuid) is True
         assert catalog.has_show(uuid.uuid4()) is False
 
-    def test_has_episode(self, mock_catalog, mock_episode):
+    def test_has_episode(self, concrete_catalog, mock_episode):
         """Test checking if an episode exists."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         assert catalog.has_episode(mock_episode.uuid) is True
         assert catalog.has_episode(uuid.uuid4()) is False
 
-    def test_get_resource(self, mock_catalog, mock_resource):
-        """Test getting a resource by URL."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
+    def test_has_host(self, concrete_catalog, mock_host):
+        """Test checking if a host exists."""
+        catalog = concrete_catalog
 
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        assert catalog.has_host(mock_host.uuid) is True
+        assert catalog.has_host(uuid.uuid4()) is False
+
+    def test_get_resource(self, concrete_catalog, mock_resource):
+        """Test getting a resource by URL."""
+        catalog = concrete_catalog
 
         resource = catalog.get_resource(mock_resource.url)
         assert resource is not None
@@ -307,15 +319,9 @@ class TestBaseStationCatalog:
         resource = catalog.get_resource("https://example.com/nonexistent")
         assert resource is None
 
-    def test_get_show(self, mock_catalog, mock_show):
+    def test_get_show(self, concrete_catalog, mock_show):
         """Test getting a show by UUID."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         show = catalog.get_show(mock_show.uuid)
         assert show is not None
@@ -324,22 +330,80 @@ class TestBaseStationCatalog:
         show = catalog.get_show(uuid.uuid4())
         assert show is None
 
-    def test_add_resource(self, mock_catalog, mock_resource):
-        """Test adding a resource."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
+    def test_get_show_by_resource(self, concrete_catalog, mock_show, mock_resource):
+        """Test looking up shows by resource, including after an add."""
+        catalog = concrete_catalog
 
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        assert catalog.get_show_by_resource(mock_resource) is mock_show
+
+        # Index must follow add_show (including replacement)
+        new_resource = Resource(
+            url="https://example.com/new-show",
+            source="https://example.com/new-show",
+            last_updated=NOW
+        )
+        assert catalog.get_show_by_resource(new_resource) is None
+        replacement = Show(
+            title="Replacement Show",
+            url="https://example.com/new-show",
+            uuid=mock_show.uuid,
+            resource=new_resource
+        )
+        catalog.add_show(replacement)
+        assert catalog.get_show_by_resource(new_resource) is replacement
+        assert catalog.get_show_by_resource(mock_resource) is None
+
+    def test_add_show_while_indexing(self, concrete_catalog):
+        """A show added by another thread while the resource index is being
+        built must still be found by get_show_by_resource."""
+        catalog = concrete_catalog
+        new_resource = Resource(
+            url="https://example.com/new-show",
+            source="https://example.com/new-show",
+            last_updated=NOW
+        )
+        new_show = Show(
+            title="New Show",
+            url="https://example.com/new-show",
+            uuid=NEW_SHOW_UUID,
+            resource=new_resource
+        )
+        adder = threading.Thread(target=catalog.add_show, args=(new_show,))
+
+        class RacingShows(dict):
+            def values(self):
+                # Add the show after the builder has read the shows but
+                # before it has installed the index.
+                snapshot = list(super().values())
+                adder.start()
+                adder.join(0.1)
+                return snapshot
+
+        catalog.catalog.shows = RacingShows(catalog.catalog.shows)
+        catalog.get_show_by_resource(new_resource)
+        adder.join()
+        assert catalog.get_show_by_resource(new_resource) is new_show
+
+    def test_get_episode_by_resource(self, concrete_catalog, mock_episode, mock_resource):
+        """Test looking up episodes by resource."""
+        catalog = concrete_catalog
+
+        assert catalog.get_episode_by_resource(mock_resource) is mock_episode
+
+        # A new catalog is indexed afresh
+        catalog.catalog = Catalog()
+        assert catalog.get_episode_by_resource(mock_resource) is None
+
+    def test_add_resource(self, concrete_catalog, mock_resource):
+        """Test adding a resource."""
+        catalog = concrete_catalog
 
         # Create a new resource
         new_resource = Resource(
             url="https://example.com/new-resource",
             source="test",
-            last_updated=datetime.now(),
-            metadata={"lastmod": datetime.now()}
+            last_updated=NOW,
+            metadata={"lastmod": NOW}
         )
 
         # Add the resource
@@ -349,26 +413,20 @@ class TestBaseStationCatalog:
         assert new_resource.url in catalog.catalog.resources
         assert catalog.catalog.resources[new_resource.url] == new_resource
 
-    def test_add_show(self, mock_catalog, mock_show):
+    def test_add_show(self, concrete_catalog, mock_show):
         """Test adding a show."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         # Create a new show
         new_show = Show(
             title="New Show",
             url="https://example.com/new-show",
             image="https://example.com/new-show.jpg",
-            uuid=uuid.uuid4(),
+            uuid=NEW_SHOW_UUID,
             description="New show description",
             hosts=[],
             episodes=[],
-            last_updated=datetime.now(),
+            last_updated=NOW,
             resource=None
         )
 
@@ -379,23 +437,17 @@ class TestBaseStationCatalog:
         assert new_show.uuid in catalog.catalog.shows
         assert catalog.catalog.shows[new_show.uuid] == new_show
 
-    def test_add_episode(self, mock_catalog, mock_episode):
+    def test_add_episode(self, concrete_catalog, mock_episode):
         """Test adding an episode."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         # Create a new episode
         new_episode = Episode(
             title="New Episode",
-            airdate=datetime.now(),
+            airdate=NOW,
             url="https://example.com/new-episode",
             media_url="https://example.com/new-episode.mp3",
-            uuid=uuid.uuid4(),
+            uuid=NEW_EPISODE_UUID,
             hosts=[],
             description="New episode description",
             resource=None
@@ -408,20 +460,14 @@ class TestBaseStationCatalog:
         assert new_episode.uuid in catalog.catalog.episodes
         assert catalog.catalog.episodes[new_episode.uuid] == new_episode
 
-    def test_add_host(self, mock_catalog, mock_host):
+    def test_add_host(self, concrete_catalog, mock_host):
         """Test adding a host."""
-        # Create a concrete implementation of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog = ConcreteCatalog()
-        catalog.catalog = mock_catalog
+        catalog = concrete_catalog
 
         # Create a new host
         new_host = Host(
             name="New Host",
-            uuid=uuid.uuid4(),
+            uuid=NEW_HOST_UUID,
             title="New Title",
             url="https://example.com/new-host",
             image="https://example.com/new-host.jpg",
@@ -435,15 +481,9 @@ class TestBaseStationCatalog:
         assert new_host.uuid in catalog.catalog.hosts
         assert catalog.catalog.hosts[new_host.uuid] == new_host
 
-    def test_diff(self, mock_catalog):
+    def test_diff(self, concrete_catalog):
         """Test diffing two catalogs."""
-        # Create two concrete implementations of the abstract class
-        class ConcreteCatalog(BaseStationCatalog):
-            def load(self) -> Catalog:
-                return mock_catalog
-
-        catalog1 = ConcreteCatalog()
-        catalog1.catalog = mock_catalog
+        catalog1 = concrete_catalog
 
         # Create a second catalog with some differences
         catalog2 = ConcreteCatalog()
@@ -453,8 +493,8 @@ class TestBaseStationCatalog:
         new_resource = Resource(
             url="https://example.com/new-resource",
             source="test",
-            last_updated=datetime.now(),
-            metadata={"lastmod": datetime.now()}
+            last_updated=NOW,
+            metadata={"lastmod": NOW}
         )
         catalog2.catalog.resources[new_resource.url] = new_resource
 
@@ -462,8 +502,8 @@ class TestBaseStationCatalog:
         modified_resource = Resource(
             url="https://example.com/resource",
             source="test-modified",
-            last_updated=datetime.now(),
-            metadata={"lastmod": datetime.now(), "new_field": "new_value"}
+            last_updated=NOW,
+            metadata={"lastmod": NOW, "new_field": "new_value"}
         )
         catalog2.catalog.resources[modified_resource.url] = modified_resource
 
@@ -491,78 +531,75 @@ class TestBaseStationCatalog:
         assert diff.modified[0].diff["values_changed"]["root['source']"]["new_value"] == "test-modified"
 
 
+@pytest.fixture
+def local_catalog(tmp_path):
+    """A LocalStationCatalog over an empty tmp_path with a mock feed persister."""
+    local_source = CacheSource(str(tmp_path), TEST_CONFIG)
+    return LocalStationCatalog(
+        catalog_source=local_source,
+        state_file="test_state.json",
+        feed_persister=MockFeedPersister()
+    )
+
+
 class TestLocalStationCatalog:
     """Tests for the LocalStationCatalog class."""
 
-    def test_init(self, tmp_path):
+    def test_init(self, local_catalog, tmp_path):
         """Test initialization."""
-        # Create a temporary directory for testing
-        storage_root = str(tmp_path)
-        state_file = "test_state.json"
-
-        # Create a mock feed persister
-        feed_persister = MockFeedPersister()
-
-        # Create a CacheSource for local storage
-        local_source = CacheSource(storage_root, TEST_CONFIG)
+        assert isinstance(local_catalog.catalog_source, CacheSource)
+        assert local_catalog.catalog_source.path == str(tmp_path)
+        assert local_catalog.state_file == "test_state.json"
+        assert isinstance(local_catalog.feed_persister, MockFeedPersister)
 
-        # Create a LocalStationCatalog
-        catalog = LocalStationCatalog(
-            catalog_source=local_source,
-            state_file=state_file,
-            feed_persister=feed_persister
-        )
-
-        assert catalog.catalog_source == local_source
-        assert catalog.state_file == state_file
-        assert catalog.feed_persister == feed_persister
-
-    def test_save_state(self, tmp_path):
+    def test_save_state(self, local_catalog, tmp_path):
         """Test saving state."""
-        # Create a temporary directory for testing
-        storage_root = str(tmp_path)
-        state_file = "test_state.json"
-
-        # Create a mock feed persister
-        feed_persister = MockFeedPersister()
-
-        # Create a CacheSource for local storage
-        local_source = CacheSource(storage_root, TEST_CONFIG)
-
-        # Create a LocalStationCatalog
-        catalog = LocalStationCatalog(
-            catalog_source=local_source,
-            state_file=state_file,
-            feed_persister=feed_persister
-        )
-
         # Mock the state persister
-        catalog.state_persister = MockStatePersister(storage_root, state_file)
+        local_catalog.state_persister = MockStatePersister(
+            str(tmp_path), local_catalog.state_file)
 
         # Save the state
-        catalog.save_state()
+        local_catalog.save_state()
 
         # Check that the state was saved correctly
-        assert len(catalog.state_persister.saved_states) == 2
+        assert len(local_catalog.state_persister.saved_states) == 2
         assert isinstance(
-            catalog.state_persister.saved_states[0], ShowDirectory)
-        assert isinstance(catalog.state_persister.saved_states[1], Catalog)
+            local_catalog.state_persister.saved_states[0], ShowDirectory)
+        assert isinstance(local_catalog.state_persister.saved_states[1], Catalog)
 
 
-def test_load_from_golden_files():
-    """Test loading a catalog from golden files in tests/data directory."""
-    # Create a CacheSource for the golden files directory
+@pytest.fixture(scope="session")
+def golden_catalog():
+    """The catalog loaded from the golden files, parsed once per session."""
     local_source = CacheSource(GOLDEN_FILES_DIR, TEST_CONFIG)
-
-    # Create a local catalog pointing to the tests/data directory
     catalog = LocalStationCatalog(
         catalog_source=local_source,
         state_file=CATALOG_FILE,
         feed_persister=None
     )
+    return catalog.load()
+
+
+@pytest.fixture(scope="session")
+def golden_json_files():
+    """The raw (directory_data, catalog_data) dicts of the golden files."""
+    golden_directory_file = os.path.join(GOLDEN_FILES_DIR, DIRECTORY_FILE)
+    golden_catalog_file = os.path.join(GOLDEN_FILES_DIR, CATALOG_FILE)
+    if not os.path.exists(golden_directory_file) or not os.path.exists(golden_catalog_file):
+        pytest.skip("kcrw_feed.json or kcrw_catalog.json not found")
+
+    with open(golden_directory_file, "rb") as f:
+        directory_data = orjson.loads(f.read())
+
+    with open(golden_catalog_file, "rb") as f:
+        catalog_data = orjson.loads(f.read())
 
-    # Load the catalog from the golden files
-    loaded_catalog = catalog.load()
+    return directory_data, catalog_data
+
+
+def test_load_from_golden_files(golden_catalog):
+    """Test loading a catalog from golden files in tests/data directory."""
+    loaded_catalog = golden_catalog
 
     # Check that the catalog was loaded correctly
     assert loaded_catalog is not None
@@ -570,7 +607,7 @@ def test_load_from_golden_files():
     # Check that shows were loaded
     assert len(loaded_catalog.shows) > 0
     # Sample a few shows and check their properties
-    for show_uuid, show in list(loaded_catalog.shows.items())[:3]:
+    for show_uuid, show in islice(loaded_catalog.shows.items(), 3):
         assert show.title is not None
         assert show.url is not None
         assert show.uuid is not None
@@ -578,7 +615,7 @@ def test_load_from_golden_files():
     # Check that episodes were loaded
     assert len(loaded_catalog.episodes) > 0
     # Sample a few episodes and check their properties
-    for episode_uuid, episode in list(loaded_catalog.episodes.items())[:3]:
+    for episode_uuid, episode in islice(loaded_catalog.episodes.items(), 3):
         assert episode.title is not None
         assert episode.url is not None
         assert episode.uuid is not None
@@ -587,7 +624,7 @@ def test_load_from_golden_files():
     # Check that hosts were loaded
     assert len(loaded_catalog.hosts) > 0
     # Sample a few hosts and check their properties
-    for host_uuid, host in list(loaded_catalog.hosts.items())[:3]:
+    for host_uuid, host in islice(loaded_catalog.hosts.items(), 3):
         assert host.name is not None
         assert host.url is not None
         assert host.uuid is not None
@@ -595,7 +632,7 @@ def test_load_from_golden_files():
     # Check that resources were loaded
     assert len(loaded_catalog.resources) > 0
     # Sample a few resources and check their properties
-    for resource_url, resource in list(loaded_catalog.resources.items())[:3]:
+    for resource_url, resource in islice(loaded_catalog.resources.items(), 3):
         assert resource.url is not None
         assert resource.source is not None
         assert resource.last_updated is not None
@@ -603,20 +640,16 @@ def test_load_from_golden_files():
 
 def test_compare_directory_and_catalog_files(tmp_path):
     """Test comparing kcrw_feed.json and kcrw_catalog.json to ensure they're consistent."""
-    # Create temporary files for testing
-    directory_file = tmp_path / DIRECTORY_FILE
-    catalog_file = tmp_path / CATALOG_FILE
-
     # Create a mock show directory
     show = Show(
         title="Test Show",
         url="https://example.com/show",
         image="https://example.com/show.jpg",
-        uuid=uuid.uuid4(),
+        uuid=SHOW_UUID,
         description="Test show description",
         hosts=[],
         episodes=[],
-        last_updated=datetime.now(),
+        last_updated=NOW,
         resource=None
     )
 
@@ -629,18 +662,12 @@ def test_compare_directory_and_catalog_files(tmp_path):
     # Create a state persister
     state_persister = StatePersister(str(tmp_path), "test_state.json")
 
-    # Save the show directory and catalog
-    state_persister.save(show_directory, str(directory_file))
-    state_persister.save(catalog, str(catalog_file))
+    # Serialize both in memory; the file round trip is covered by the
+    # StatePersister tests
+    directory_data = orjson.loads(state_persister.serialize(show_directory))
+    catalog_data = orjson.loads(state_persister.serialize(catalog))
 
-    # Load the files
-    with open(directory_file, "r") as f:
-        directory_data = json.load(f)
-
-    with open(catalog_file, "r") as f:
-        catalog_data = json.load(f)
-
-    # Check that the files are consistent
+    # Check that the two representations are consistent
     assert directory_data["shows"][0]["uuid"] == catalog_data["shows"][str(
         show.uuid)]["uuid"]
     assert directory_data["shows"][0]["title"] == catalog_data["shows"][str(
@@ -649,20 +676,9 @@ def test_compare_directory_and_catalog_files(tmp_path):
         show.uuid)]["url"]
 
 
-def test_compare_real_directory_and_catalog_files():
+def test_compare_real_directory_and_catalog_files(golden_json_files):
     """Test comparing real kcrw_feed.json and kcrw_catalog.json files."""
-    # Skip this test if the files don't exist
-    golden_directory_file = os.path.join(GOLDEN_FILES_DIR, DIRECTORY_FILE)
-    golden_catalog_file = os.path.join(GOLDEN_FILES_DIR, CATALOG_FILE)
-    if not os.path.exists(golden_directory_file) or not os.path.exists(golden_catalog_file):
-        pytest.skip("kcrw_feed.json or kcrw_catalog.json not found")
-
-    # Load the files
-    with open(golden_directory_file, "r") as f:
-        directory_data = json.load(f)
-
-    with open(golden_catalog_file, "r") as f:
-        catalog_data = json.load(f)
+    directory_data, catalog_data = golden_json_files
 
     # Check that the files have the expected structure
     assert "shows" in directory_data
@@ -674,28 +690,32 @@ def test_compare_real_directory_and_catalog_files():
     directory_shows = {show["uuid"]: show for show in directory_data["shows"]}
     catalog_shows = catalog_data["shows"]
 
+    # Group catalog episodes by show once rather than rescanning per show
+    episodes_by_show = defaultdict(dict)
+    for episode_uuid, episode in catalog_data.get("episodes", {}).items():
+        episodes_by_show[episode.get("show_uuid")][episode_uuid] = episode
+
     # Check that all shows in the directory are in the catalog
-    for show_uuid, show in directory_shows.items():
-        assert show_uuid in catalog_shows, f"Show {show_uuid} in directory but not in catalog"
-        catalog_show = catalog_shows[show_uuid]
-
-        # Check that the show data is consistent
-        assert show["title"] == catalog_show[
-            "title"], f"Title mismatch for show {show_uuid}"
-        assert show["url"] == catalog_show["url"], f"URL mismatch for show {show_uuid}"
-
-        # Check that the episodes are consistent
-        directory_episodes = {
-            episode["uuid"]: episode for episode in show.get("episodes", [])}
-        catalog_episodes = {episode_uuid: episode for episode_uuid, episode in catalog_data.get("episodes", {}).items()
-                            if episode.get("show_uuid") == show_uuid}
-
-        for episode_uuid, episode in directory_episodes.items():
-            assert episode_uuid in catalog_episodes, f"Episode {episode_uuid} in directory but not in catalog"
-            catalog_episode = catalog_episodes[episode_uuid]
-
-            # Check that the episode data is consistent
-            assert episode["title"] == catalog_episode[
-                "title"], f"Title mismatch for episode {episode_uuid}"
-            assert episode["url"] == catalog_episode[
-                "url"], f"URL mismatch for episode {episode_uuid}"
+    missing_shows = directory_shows.keys() - catalog_shows.keys()
+    assert not missing_shows, f"Shows in directory but not in catalog: {missing_shows}"
+
+    # Check that the show data is consistent
+    for field in ("title", "url"):
+        mismatches = [show_uuid for show_uuid, show in directory_shows.items()
+                      if show[field] != catalog_shows[show_uuid][field]]
+        assert not mismatches, f"Show {field} mismatch for {mismatches}"
+
+    # Check that the episodes are consistent
+    directory_episodes = {
+        episode["uuid"]: (show_uuid, episode)
+        for show_uuid, show in directory_shows.items()
+        for episode in show.get("episodes", [])}
+    missing_episodes = [
+        episode_uuid for episode_uuid, (show_uuid, _) in directory_episodes.items()
+        if episode_uuid not in episodes_by_show.get(show_uuid, {})]
+    assert not missing_episodes, f"Episodes in directory but not in catalog: {missing_episodes}"
+    for field in ("title", "url"):
+        mismatches = [
+            episode_uuid for episode_uuid, (show_uuid, episode) in directory_episodes.items()
+            if episode[field] != episodes_by_show[show_uuid][episode_uuid][field]]
+        assert not mismatches, f"Episode {field} mismatch for {mismatches}"
@@ -7,6 +7,10 @@ import uuid
 from kcrw_feed.models import Episode, Host, Show
 from kcrw_feed import utils
 
+# The dedup tests only care about uuids; a fixed airdate avoids a clock
+# read per test.
+AIRDATE = datetime(2025, 1, 1)
+
 
 def test_extract_uuid_plain():
     text = "a73ec36f655c9452cf88f50e99cba946"
@@ -66,13 +70,12 @@ def test_extract_uuid_multiple_matches():
 
 def test_deduplication():
     """Test that uniq_by_uuid() correctly deduplicates episodes."""
-    dt = datetime.now()
-    ep1 = Episode(title="Episode 1", airdate=dt, url="url1",
+    ep1 = Episode(title="Episode 1", airdate=AIRDATE, url="url1",
                   media_url="media1", uuid="uuid1")
     # Duplicate with same UUID.
-    ep2 = Episode(title="Episode 2", airdate=dt, url="url2",
+    ep2 = Episode(title="Episode 2", airdate=AIRDATE, url="url2",
                   media_url="media2", uuid="uuid1")
-    ep3 = Episode(title="Episode 3", airdate=dt, url="url3",
+    ep3 = Episode(title="Episode 3", airdate=AIRDATE, url="url3",
                   media_url="media3", uuid="uuid2")
     episodes = [ep1, ep2, ep3]
     deduped = utils.uniq_by_uuid(episodes)
@@ -85,10 +88,9 @@ def test_deduplication():
 def test_no_duplicates():
     """Test that uniq_by_uuid() returns all episodes when there
     are no duplicates."""
-    dt = datetime.now()
-    ep1 = Episode(title="Episode 1", airdate=dt, url="url1",
+    ep1 = Episode(title="Episode 1", airdate=AIRDATE, url="url1",
                   media_url="media1", uuid="uuid1")
-    ep2 = Episode(title="Episode 2", airdate=dt, url="url2",
+    ep2 = Episode(title="Episode 2", airdate=AIRDATE, url="url2",
                   media_url="media2", uuid="uuid2")
     episodes = [ep1, ep2]
     deduped = utils.uniq_by_uuid(episodes)
@@ -97,10 +99,9 @@ def test_no_duplicates():
 
 def test_none_uuid():
     """Test that episodes with no UUID are all included."""
-    dt = datetime.now()
-    ep1 = Episode(title="Episode 1", airdate=dt, url="url1",
+    ep1 = Episode(title="Episode 1", airdate=AIRDATE, url="url1",
                   media_url="media1", uuid=None)
-    ep2 = Episode(title="Episode 2", airdate=dt, url="url2",
+    ep2 = Episode(title="Episode 2", airdate=AIRDATE, url="url2",
                   media_url="media2", uuid=None)
     episodes = [ep1, ep2]
     deduped = utils.uniq_by_uuid(episodes)
@@ -109,16 +110,15 @@ def test_none_uuid():
 
 def test_mix_of_none_and_duplicates():
     """Test deduplication on a mix of episodes with None and duplicate UUIDs."""
-    dt = datetime.now()
-    ep1 = Episode(title="Episode 1", airdate=dt, url="url1",
+    ep1 = Episode(title="Episode 1", airdate=AIRDATE, url="url1",
                   media_url="media1", uuid="uuid1")
-    ep2 = Episode(title="Episode 2", airdate=dt, url="url2",
+    ep2 = Episode(title="Episode 2", airdate=AIRDATE, url="url2",
                   media_url="media2", uuid=None)
-    ep3 = Episode(title="Episode 3", airdate=dt, url="url3",
+    ep3 = Episode(title="Episode 3", airdate=AIRDATE, url="url3",
                   media_url="media3", uuid="uuid1")
-    ep4 = Episode(title="Episode 4", airdate=dt, url="url4",
+    ep4 = Episode(title="Episode 4", airdate=AIRDATE, url="url4",
                   media_url="media4", uuid="uuid2")
-    ep5 = Episode(title="Episode 5", airdate=dt, url="url5",
+    ep5 = Episode(title="Episode 5", airdate=AIRDATE, url="url5",
                   media_url="media5", uuid=None)
     episodes = [ep1, ep2, ep3, ep4, ep5]
     deduped = utils.uniq_by_uuid(episodes)
@@ -131,12 +131,11 @@ def test_mix_of_none_and_duplicates():
 
 
 def test_dedup_homogeneous_episodes():
-    dt = datetime.now()
-    ep1 = Episode(title="Episode 1", airdate=dt, url="url1",
+    ep1 = Episode(title="Episode 1", airdate=AIRDATE, url="url1",
                   media_url="media1", uuid="uuid1")
-    ep2 = Episode(title="Episode 2", airdate=dt, url="url2",
+    ep2 = Episode(title="Episode 2", airdate=AIRDATE, url="url2",
                   media_url="media2", uuid="uuid1")
-    ep3 = Episode(title="Episode 3", airdate=dt, url="url3",
+    ep3 = Episode(title="Episode 3", airdate=AIRDATE, url="url3",
                   media_url="media3", uuid="uuid2")
     episodes = [ep1, ep2, ep3]
     deduped = utils.uniq_by_uuid(episodes)
@@ -158,14 +157,21 @@ def test_dedup_homogeneous_hosts():
 
 
 def test_mixed_types_dedup():
-    dt = datetime.now()
-    ep = Episode(title="Episode 1", airdate=dt, url="url1",
+    ep = Episode(title="Episode 1", airdate=AIRDATE, url="url1",
                  media_url="media1", uuid="uuid1")
     h = Host(uuid="host1", name="Alice")
     with pytest.raises(AssertionError, match="Mixed types provided to uniq_by_uuid"):
         utils.uniq_by_uuid([ep, h])
 
 
+def test_uniq_uuids():
+    """Test that uniq_uuids() drops repeats in order but keeps every None."""
+    u1 = uuid.UUID(int=1)
+    u2 = uuid.UUID(int=2)
+    assert utils.uniq_uuids([u1, None, u2, u1, None, u2]) == [u1, None, u2, None]
+    assert utils.uniq_uuids(iter([])) == []
+
+
 def test_parse_date_valid():
     date_str = "2025-04-01T12:00:00"
     result = utils.parse_date(date_str)
@@ -190,3 +196,8 @@ def test_parse_date_invalid_string():
     date_str = "not-a-date"
     result = utils.parse_date(date_str)
     assert result is None
+
+
+def test_parse_date_cached():
+    date_str = "2025-04-01T12:00:00"
+    assert utils.parse_date(date_str) is utils.parse_date(date_str)